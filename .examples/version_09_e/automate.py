@@ -34,13 +34,16 @@ async def execute_automation_sequence(page, steps: List[AutomationStep]) -> Auto
             try:
                 # Execute step action
                 if step.action == 'click':
-                    await page.evaluate(js.click_element(step.selector))
+                    await page.evaluate(js.click_element(), step.selector)
                 elif step.action == 'fill':
-                    await page.evaluate(js.fill_form(step.selector, step.value))
+                    await page.evaluate(js.fill_form(), [step.selector, str(step.value)])
                 elif step.action == 'submit':
-                    await page.evaluate(js.submit_form(step.selector))
+                    await page.evaluate(js.submit_form(), step.selector)
                 elif step.action == 'wait':
-                    await asyncio.sleep(step.wait_time)
+                    if step.selector:
+                        await page.wait_for_selector(step.selector, timeout=config.browser_timeout, state="attached")
+                    else:
+                        await asyncio.sleep(step.wait_time)
                 elif step.action == 'scroll':
                     await page.evaluate(js.scroll_to_bottom())
                 elif step.action == 'navigate':
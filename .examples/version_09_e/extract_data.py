@@ -26,11 +26,12 @@ async def extract_page_data(page, include_html: bool = False, screenshot: bool =
         # Extract basic page information
         title = await page.title()
         
-        # Execute JavaScript helpers to extract data
-        links = await page.evaluate(js.get_all_links())
-        images = await page.evaluate(js.get_all_images())
-        forms = await page.evaluate(js.get_all_forms())
-        metadata = await page.evaluate(js.get_page_metadata())
+        # Extract links, images, forms and metadata in one round-trip
+        bundle = await page.evaluate(js.get_page_bundle())
+        links = bundle['links']
+        images = bundle['images']
+        forms = bundle['forms']
+        metadata = bundle['metadata']
         
         # Get text content
         text_content = await page.evaluate('document.body.textContent')
@@ -6,8 +6,6 @@ from utils.config import Config
 from utils.models import DataExtractionResult
 from start_browser import start_browser
 from navigate import navigate_to_url
-from extract_data import extract_page_data
-from save_data import save_as_json, save_as_csv
 
 logger = setup_logger(__name__)
 config = Config()
@@ -35,6 +33,10 @@ async def main():
 
         # Extract data if requested
         if args.extract:
+            # Only extraction runs need these modules, so don't pay for them on every start
+            from extract_data import extract_page_data
+            from save_data import save_as_json, save_as_csv
+            
             data = await extract_page_data(
                 page, 
                 include_html=True,
@@ -1,20 +1,34 @@
 #!/usr/bin/env python3
+import asyncio
 import json
 import csv
 import os
+from dataclasses import asdict
 from datetime import datetime
+from pathlib import Path
 from typing import Union, Optional
 from utils.logger import setup_logger
 from utils.config import Config
 from utils.models import DataExtractionResult, NavigationResult, AutomationResult
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = setup_logger(__name__)
 config = Config()
 
+DATA_DIR = 'browser_agent/data'
+_DIR_READY = False
+
 def ensure_data_directory() -> str:
-    """Ensure data directory exists and return path"""
-    os.makedirs('browser_agent/data', exist_ok=True)
-    return 'browser_agent/data'
+    """Ensure data directory exists and return path (created once per process)"""
+    global _DIR_READY
+    if not _DIR_READY:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        _DIR_READY = True
+    return DATA_DIR
 
 def save_as_json(data: Union[DataExtractionResult, NavigationResult, AutomationResult], filename: Optional[str] = None) -> str:
     """
@@ -27,9 +41,9 @@ def save_as_json(data: Union[DataExtractionResult, NavigationResult, AutomationR
     """
     try:
         data_dir = ensure_data_directory()
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
         if not filename:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             if isinstance(data, DataExtractionResult):
                 filename = f"extraction_{timestamp}.json"
             elif isinstance(data, NavigationResult):
@@ -39,8 +53,13 @@ def save_as_json(data: Union[DataExtractionResult, NavigationResult, AutomationR
 
         filepath = os.path.join(data_dir, filename)
         
-        with open(filepath, 'w') as f:
-            json.dump(data.__dict__, f, indent=2)
+        if orjson is not None:
+            # orjson serializes dataclasses (slotted or not) natively; str() covers anything else
+            payload = orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(asdict(data), indent=2, default=str).encode('utf-8')
+        with open(filepath, 'wb') as f:
+            f.write(payload)
 
         logger.info("Data saved to JSON: %s", filepath)
         return filepath
@@ -60,9 +79,9 @@ def save_as_csv(data: Union[DataExtractionResult, NavigationResult], filename: O
     """
     try:
         data_dir = ensure_data_directory()
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
         if not filename:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             if isinstance(data, DataExtractionResult):
                 filename = f"extraction_{timestamp}.csv"
             else:
@@ -70,29 +89,22 @@ def save_as_csv(data: Union[DataExtractionResult, NavigationResult], filename: O
 
         filepath = os.path.join(data_dir, filename)
         
-        with open(filepath, 'w', newline='') as f:
-            writer = csv.writer(f)
-            
-            if isinstance(data, DataExtractionResult):
-                # Write header
-                writer.writerow(['URL', 'Title', 'Text Content', 'Links Count', 'Images Count', 'Forms Count'])
-                # Write data
-                writer.writerow([
-                    data.url,
-                    data.title,
-                    data.text_content[:100] + '...' if len(data.text_content) > 100 else data.text_content,
-                    len(data.links),
-                    len(data.images),
-                    len(data.forms)
-                ])
-            else:
-                writer.writerow(['URL', 'Final URL', 'Status Code', 'Success'])
-                writer.writerow([
-                    data.url,
-                    data.final_url,
-                    data.status_code,
-                    data.success
-                ])
+        if isinstance(data, DataExtractionResult):
+            text = data.text_content
+            rows = [
+                ['URL', 'Title', 'Text Content', 'Links Count', 'Images Count', 'Forms Count'],
+                [data.url, data.title, text[:100] + '...' if len(text) > 100 else text,
+                 len(data.links), len(data.images), len(data.forms)]
+            ]
+        else:
+            rows = [
+                ['URL', 'Final URL', 'Status Code', 'Success'],
+                [data.url, data.final_url, data.status_code, data.success]
+            ]
+        
+        with open(filepath, 'w', newline='', buffering=65536, encoding='utf-8') as f:
+            # Header and data row in one call
+            csv.writer(f).writerows(rows)
 
         logger.info("Data saved to CSV: %s", filepath)
         return filepath
@@ -103,22 +115,29 @@ def save_as_csv(data: Union[DataExtractionResult, NavigationResult], filename: O
 
 async def save_screenshot(page, filename: Optional[str] = None) -> str:
     """
-    Save page screenshot
+    Save page screenshot (viewport only), writing the file off the event loop
     Args:
-        page: Pyppeteer page object
+        page: Playwright page object
         filename: Optional custom filename
     Returns:
         Path to saved screenshot
     """
     try:
         data_dir = ensure_data_directory()
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
         if not filename:
-            filename = f"screenshot_{timestamp}.png"
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            # A quality below 100 asks for lossy output, so default to JPEG in that case
+            ext = 'jpg' if config.screenshot_quality < 100 else 'png'
+            filename = f"screenshot_{timestamp}.{ext}"
 
         filepath = os.path.join(data_dir, filename)
-        await page.screenshot({'path': filepath, 'quality': config.screenshot_quality})
+        options = {'full_page': False}
+        if filepath.lower().endswith(('.jpg', '.jpeg')):
+            # Quality only applies to JPEG
+            options.update(type='jpeg', quality=config.screenshot_quality)
+        image = await page.screenshot(**options)
+        await asyncio.to_thread(Path(filepath).write_bytes, image)
 
         logger.info("Screenshot saved: %s", filepath)
         return filepath
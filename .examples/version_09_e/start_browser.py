@@ -6,35 +6,53 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Read once at import; use set_keep_open() to override instead of changing the environment
+KEEP_BROWSER_OPEN = os.getenv('KEEP_BROWSER_OPEN', 'false').lower() == 'true'
+
+def set_keep_open(keep_open: bool):
+    """Override the KEEP_BROWSER_OPEN setting read from the environment"""
+    global KEEP_BROWSER_OPEN
+    KEEP_BROWSER_OPEN = keep_open
+
 # Default configuration values
 DEFAULT_VIEWPORT = {'width': 1280, 'height': 720}
+_BASE_ARGS = (
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-accelerated-2d-canvas',
+    '--disable-gpu',
+    # Cut Chromium's idle background work so it doesn't compete with page rendering
+    '--disable-background-networking',
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-features=Translate,BackForwardCache'
+)
 DEFAULT_LAUNCH_ARGS = {
     'headless': False,
-    'args': [
-        '--no-sandbox',
-        '--disable-setuid-sandbox',
-        '--disable-dev-shm-usage',
-        '--disable-accelerated-2d-canvas',
-        '--disable-gpu'
-    ]
+    'args': _BASE_ARGS
 }
 
-async def start_browser(headless: Optional[bool] = None) -> tuple:
-        """Initialize and return browser resources without keep_open logic"""
+async def start_browser(headless: Optional[bool] = None, keep_open: Optional[bool] = None) -> tuple:
     """
     Initialize and return a browser and page instance
     Args:
         headless: Override config headless setting if specified
+        keep_open: Override KEEP_BROWSER_OPEN if specified
     Returns:
-        Tuple of (browser, page) instances
+        Tuple of (browser, page, playwright) instances
     """
+    if keep_open is not None:
+        set_keep_open(keep_open)
+
     try:
-        """Initialize browser with Playwright"""
         from playwright.async_api import async_playwright
         
-        launch_args = DEFAULT_LAUNCH_ARGS.copy()
-        if headless is not None:
-            launch_args['headless'] = headless
+        # Only build a new kwargs dict when the defaults are overridden
+        if headless is None:
+            launch_args = DEFAULT_LAUNCH_ARGS
+        else:
+            launch_args = {'headless': headless, 'args': _BASE_ARGS}
 
         print(f"Launching browser with args: {launch_args}")
         playwright = await async_playwright().start()
@@ -69,10 +87,9 @@ def main():
     async def run():
         browser, page, playwright = await start_browser(
             headless=args.headless,
-            keep_open=args.keep_open
+            keep_open=args.keep_open or None  # Flag absent: keep the .env setting
         )
-        # Get final keep_open state from environment if not set by args
-        final_keep_open = args.keep_open or os.getenv('KEEP_BROWSER_OPEN', 'false').lower() == 'true'
+        final_keep_open = KEEP_BROWSER_OPEN
         print(f"Final keep_open state: {final_keep_open}")
         
         print(f"DEBUG: Starting cleanup (final_keep_open={final_keep_open})")
@@ -49,47 +49,45 @@ class JavaScriptHelpers:
         return "window.scrollTo(0, document.body.scrollHeight)"
 
     @staticmethod
-    def wait_for_element(selector: str, timeout: int = 30000) -> str:
-        """JS to wait for element to appear"""
-        return f"""
-            new Promise((resolve, reject) => {{
-                const element = document.querySelector('{selector}');
-                if (element) return resolve(element);
-                
-                const observer = new MutationObserver(() => {{
-                    const element = document.querySelector('{selector}');
-                    if (element) {{
-                        observer.disconnect();
-                        resolve(element);
-                    }}
-                }});
-                
-                observer.observe(document.body, {{
-                    childList: true,
-                    subtree: true
-                }});
-                
-                setTimeout(() => {{
-                    observer.disconnect();
-                    reject(new Error('Timeout waiting for element'));
-                }}, {timeout});
-            }})
+    def wait_for_element() -> str:
+        """
+        JS to wait for element to appear, called as page.evaluate(js, [selector, timeout]).
+        Deprecated: prefer page.wait_for_selector(selector, state="attached"), which needs no page-side JS.
+        """
+        return """
+            ([selector, timeout]) => new Promise((resolve, reject) => {
+                const deadline = performance.now() + timeout;
+                const poll = () => {
+                    if (document.querySelector(selector)) return resolve(true);
+                    if (performance.now() > deadline) return reject(new Error('Timeout waiting for element'));
+                    requestAnimationFrame(poll);
+                };
+                poll();
+            })
         """
 
     @staticmethod
-    def click_element(selector: str) -> str:
-        """JS to click element by selector"""
-        return f"document.querySelector('{selector}').click()"
+    def click_element() -> str:
+        """JS to click element, called as page.evaluate(js, selector)"""
+        return "(selector) => document.querySelector(selector).click()"
 
     @staticmethod
-    def fill_form(selector: str, value: str) -> str:
-        """JS to fill form field"""
-        return f"document.querySelector('{selector}').value = '{value}'"
+    def fill_form() -> str:
+        """JS to fill form field, called as page.evaluate(js, [selector, value])"""
+        return """
+            ([selector, value]) => {
+                const el = document.querySelector(selector);
+                el.value = value;
+                // Let React/Vue style frameworks see the change
+                el.dispatchEvent(new Event('input', {bubbles: true}));
+                el.dispatchEvent(new Event('change', {bubbles: true}));
+            }
+        """
 
     @staticmethod
-    def submit_form(selector: str) -> str:
-        """JS to submit form"""
-        return f"document.querySelector('{selector}').submit()"
+    def submit_form() -> str:
+        """JS to submit form, called as page.evaluate(js, selector)"""
+        return "(selector) => document.querySelector(selector).submit()"
 
     @staticmethod
     def get_page_metadata() -> str:
@@ -102,4 +100,48 @@ class JavaScriptHelpers:
                 viewport: document.querySelector('meta[name="viewport"]')?.content,
                 canonical: document.querySelector('link[rel="canonical"]')?.href
             })
-        """
\ No newline at end of file
+        """
+
+    @staticmethod
+    def get_page_bundle() -> str:
+        """JS to extract links, images, forms and metadata in a single evaluate"""
+        return """
+            (() => {
+                const links = [], images = [], forms = [];
+                for (const el of document.querySelectorAll('a, img, form')) {
+                    switch (el.tagName) {
+                        case 'A':
+                            links.push({href: el.href, text: el.textContent.trim(), title: el.title});
+                            break;
+                        case 'IMG':
+                            images.push({src: el.src, alt: el.alt, width: el.naturalWidth, height: el.naturalHeight});
+                            break;
+                        case 'FORM':
+                            forms.push({
+                                id: el.id,
+                                action: el.action,
+                                method: el.method,
+                                inputs: Array.from(el.elements).map(input => ({
+                                    name: input.name,
+                                    type: input.type,
+                                    value: input.value
+                                }))
+                            });
+                            break;
+                    }
+                }
+                const meta = name => document.querySelector(`meta[name="${name}"]`)?.content;
+                return {
+                    links,
+                    images,
+                    forms,
+                    metadata: {
+                        title: document.title,
+                        description: meta('description'),
+                        keywords: meta('keywords'),
+                        viewport: meta('viewport'),
+                        canonical: document.querySelector('link[rel="canonical"]')?.href
+                    }
+                };
+            })()
+        """
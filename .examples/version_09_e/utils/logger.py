@@ -1,17 +1,23 @@
 #!/usr/bin/env python3
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+from typing import Optional
 
-def setup_logger(name: str = __name__) -> logging.Logger:
-    """Configure and return a logger with file and console handlers"""
-    log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
-    log_file = os.getenv('LOG_FILE', 'web_agent.log')
+# One listener thread owns the real handlers; loggers only enqueue records
+_queue_handler: Optional[logging.Handler] = None
 
-    logger = logging.getLogger(name)
-    logger.setLevel(log_level)
+def _get_queue_handler(log_level: str, log_file: str) -> logging.Handler:
+    """Start the background log listener on first use and return the handler that feeds it"""
+    global _queue_handler
+    if _queue_handler is not None:
+        return _queue_handler
 
-    file_handler = logging.FileHandler(log_file)
+    # delay=True: don't open the log file until the first record is written
+    file_handler = logging.FileHandler(log_file, delay=True)
     file_handler.setLevel(log_level)
 
     console_handler = logging.StreamHandler()
@@ -21,7 +27,28 @@ def setup_logger(name: str = __name__) -> logging.Logger:
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
 
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    return _queue_handler
+
+def setup_logger(name: str = __name__) -> logging.Logger:
+    """Configure and return a logger whose file and console output is written on a background thread"""
+    log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
+    log_file = os.getenv('LOG_FILE', 'web_agent.log')
+
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        # Already configured - adding handlers again would emit every record twice
+        return logger
+    logger.setLevel(log_level)
+    logger.propagate = False
+
+    logger.addHandler(_get_queue_handler(log_level, log_file))
     
-    return logger
\ No newline at end of file
+    return logger
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
+import sys
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Union
 
-@dataclass
+# slots=True is only accepted from Python 3.10 onward
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class DataExtractionResult:
     """Result container for extracted data from a webpage"""
     url: str
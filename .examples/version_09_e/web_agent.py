@@ -9,16 +9,21 @@ Supports two modes:
 
 import asyncio
 import argparse
+import contextlib
+import functools
+import itertools
 import json
 import logging
 import os
+import re
 import sys
 import subprocess
+import threading
 import time
-import requests
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, is_dataclass
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
 from urllib.parse import urlparse
 
@@ -27,20 +32,48 @@ load_dotenv()
 
 # Import required packages
 try:
-    from playwright.async_api import async_playwright, Page, Browser, ElementHandle
+    from playwright.async_api import async_playwright, Page, Browser, ElementHandle, Locator, Error as PWError, TimeoutError as PWTimeoutError
 except ImportError:
     print("ERROR: Playwright not found!")
     sys.exit(1)
 
-try:
-    import google.generativeai as genai
-except ImportError:
-    genai = None
+# The AI SDKs are slow to import, so they load on first use rather than at startup
+@functools.lru_cache(maxsize=1)
+def _load_genai():
+    """Return the google.generativeai module, or None if it isn't installed"""
+    try:
+        import google.generativeai as genai
+    except ImportError:
+        return None
+    return genai
+
+@functools.lru_cache(maxsize=1)
+def _load_agno_agent():
+    """Return agno's Agent class, or None if it isn't installed"""
+    try:
+        from agno.agent import Agent
+    except ImportError:
+        return None
+    return Agent
+
+@functools.lru_cache(maxsize=1)
+def _load_prompt_session():
+    """Return a shared prompt_toolkit PromptSession for interactive terminals, or None"""
+    if not sys.stdin.isatty():
+        return None
+    try:
+        from prompt_toolkit import PromptSession
+    except ImportError:
+        return None
+    return PromptSession()
 
 try:
-    from agno.agent import Agent
+    import orjson
+    # Dataclasses (ElementInfo, PageAnalysis) serialize natively - no asdict() pass needed
+    ORJSON_OPTS = orjson.OPT_INDENT_2
 except ImportError:
-    Agent = None
+    orjson = None
+    ORJSON_OPTS = 0
 
 # Configure logging
 log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
@@ -63,6 +96,9 @@ logger.addHandler(file_handler)
 logger.addHandler(console_handler)
 
 # Data classes
+# Slotted dataclasses need Python 3.10+; older interpreters fall back to __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 @dataclass
 class BrowserState:
     logged_in: bool = False
@@ -70,8 +106,9 @@ class BrowserState:
     cookies: Dict = field(default_factory=dict)
     local_storage: Dict = field(default_factory=dict)
     session_storage: Dict = field(default_factory=dict)
+    cached_title: Optional[str] = None  # Cleared whenever the main frame navigates
 
-@dataclass
+@dataclass(**_SLOTS)
 class ElementInfo:
     index: int
     tag_name: str
@@ -80,7 +117,9 @@ class ElementInfo:
     xpath: str = ""
     is_visible: bool = True
     is_in_viewport: bool = True
-    bounding_box: Dict[str, float] = field(default_factory=dict)
+    bbox: Tuple[float, ...] = ()  # (x, y, width, height)
+    role: str = ""
+    preview: str = ""  # Display text: first 60 chars of text, with "..." when cut
     
     def to_dict(self):
         return asdict(self)
@@ -90,6 +129,14 @@ class ElementInfo:
                          if k in ['id', 'class', 'name', 'role', 'type', 'href']])
         return f"[{self.index}] <{self.tag_name} {attrs}>{self.text}</{self.tag_name}>"
 
+def json_bytes(data: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON (dataclasses included), using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=ORJSON_OPTS)
+    if is_dataclass(data):
+        data = asdict(data)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
 @dataclass
 class PageAnalysis:
     url: str
@@ -106,8 +153,7 @@ class PageAnalysis:
         }
     
     def save_to_file(self, filename: str):
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        Path(filename).write_bytes(json_bytes(self))
         logger.info(f"Analysis saved to {filename}")
 
 # Configuration class
@@ -119,6 +165,7 @@ class Config:
         self.viewport_height = int(os.getenv('VIEWPORT_HEIGHT', '800'))
         self.wait_for_network = os.getenv('WAIT_FOR_NETWORK', 'true').lower() == 'true'
         self.screenshot_quality = int(os.getenv('SCREENSHOT_QUALITY', '90'))
+        self.screenshot_full_page = os.getenv('SCREENSHOT_FULL_PAGE', 'false').lower() == 'true'
         self.disable_automation = os.getenv('DISABLE_AUTOMATION_DETECTION', 'true').lower() == 'true'
         
         # AI Configuration
@@ -130,6 +177,9 @@ class Config:
         self.automation_mode = os.getenv('AUTOMATION_MODE', 'false').lower() == 'true'
         self.max_automation_steps = int(os.getenv('MAX_AUTOMATION_STEPS', '10'))
         self.automation_delay = int(os.getenv('AUTOMATION_DELAY', '2'))
+        self.fill_timeout = int(os.getenv('FILL_TIMEOUT', '2000'))
+        self.settle_timeout = int(os.getenv('SETTLE_TIMEOUT', '1500'))
+        self.verbose = os.getenv('VERBOSE', 'true').lower() == 'true'
         self.default_mode = os.getenv('DEFAULT_MODE', 'interactive')
 
         # Validate required API keys based on mode
@@ -159,8 +209,29 @@ class Config:
         return self.website_urls.get(website_name.lower(), website_name)
 
 # JavaScript for identifying clickable elements
+# Init script: counts DOM mutations. The token pairs the count with the document's
+# timeOrigin so a new document never reuses a token from the previous one.
+JS_DOM_VERSION_TRACKER = """
+(() => {
+    window.__domVersion = 0;
+    window.__domToken = () => performance.timeOrigin + ':' + window.__domVersion;
+    const observe = () => {
+        new MutationObserver(() => { window.__domVersion++; })
+            .observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+    };
+    if (document.documentElement) {
+        observe();
+    } else {
+        document.addEventListener('DOMContentLoaded', observe, {once: true});
+    }
+})();
+"""
+
 JS_GET_CLICKABLE_ELEMENTS = """
 () => {
+    // DOM version this scan reflects
+    const domToken = window.__domToken ? window.__domToken() : null;
+    
     // Helper function to check if element is visible
     function isVisible(element) {
         if (!element.getBoundingClientRect) return false;
@@ -221,6 +292,21 @@ JS_GET_CLICKABLE_ELEMENTS = """
         return element.innerText || element.textContent || '';
     }
     
+    // Helper function to classify element for the automation planner
+    function getPlannerRole(element, tagName, text) {
+        if (tagName === 'input') {
+            const name = (element.getAttribute('name') || '').toLowerCase();
+            const placeholder = (element.getAttribute('placeholder') || '').toLowerCase();
+            if (name.includes('search') || placeholder.includes('search')) return 'search_input';
+            
+            const type = element.getAttribute('type');
+            if (type === 'text' || type === 'email' || type === 'tel') return 'form_text_input';
+        } else if (tagName === 'button' && text.toLowerCase().includes('search')) {
+            return 'search_button';
+        }
+        return '';
+    }
+    
     // Helper function to get XPath
     function getXPath(element) {
         if (!element) return '';
@@ -275,26 +361,19 @@ JS_GET_CLICKABLE_ELEMENTS = """
                 attributes[attr.name] = attr.value;
             }
             
-            // Add to results
-            clickableElements.push({
-                index: index++,
+            // Add to results as a positional row (same order as the ElementInfo fields)
+            clickableElements.push([
+                index++,
                 tagName,
-                text: text.substring(0, 100), // Limit text length
+                text.substring(0, 100), // Limit text length
                 attributes,
-                xpath: getXPath(element),
-                isVisible: true,
-                isInViewport: isInView,
-                boundingBox: {
-                    x: rect.x,
-                    y: rect.y,
-                    width: rect.width,
-                    height: rect.height,
-                    top: rect.top,
-                    right: rect.right,
-                    bottom: rect.bottom,
-                    left: rect.left
-                }
-            });
+                getXPath(element),
+                true,
+                isInView,
+                [rect.x, rect.y, rect.width, rect.height],
+                getPlannerRole(element, tagName, text),
+                text.length > 60 ? text.substring(0, 60) + '...' : text
+            ]);
         }
         
         // Process children
@@ -306,10 +385,67 @@ JS_GET_CLICKABLE_ELEMENTS = """
     // Start processing from body
     processElement(document.body);
     
-    return clickableElements;
+    return [domToken, clickableElements];
 }
 """
 
+# Login form selectors, joined so one wait_for_selector call matches any of them
+GITHUB_LOGIN_SELECTORS = {
+    'username': 'input[name="login"]',
+    'password': 'input[name="password"]',
+    'submit': ', '.join(['input[name="commit"]', 'button[data-signin-label="Sign in"]'])
+}
+
+COMMON_LOGIN_SELECTORS = {
+    'username': ', '.join([
+        'input[type="email"]', 'input[type="text"]', 'input[name="username"]',
+        'input[name="email"]', 'input[id="email"]', 'input[id="username"]', 'input[name="login"]'
+    ]),
+    'password': ', '.join(['input[type="password"]', 'input[name="password"]', 'input[id="password"]']),
+    'submit': ', '.join([
+        'button[type="submit"]', 'input[type="submit"]', 'button:has-text("Sign in")',
+        'button:has-text("Log in")', 'button:has-text("Login")', 'input[name="commit"]'
+    ])
+}
+
+# Any of these on the page after submitting credentials means the login went through
+LOGIN_SUCCESS_SELECTOR = ", ".join([
+    ".avatar", ".user-avatar", ".profile-pic", "a[href*=\"logout\"]",
+    "a[href*=\"signout\"]", ".logout-button", ".user-menu", ".dashboard"
+])
+
+# Patterns used while parsing AI responses and workflow descriptions
+_RE_NUM = re.compile(r'\d+\.')
+_URL_RE = re.compile(r'https?://[^\s]+')
+_NAV_TRIGGERS = frozenset({'to', 'visit', 'open', 'navigate'})
+_NAV_PREFIXES = ('navigate to', 'go to', 'visit ', 'open ')
+_WAIT_TASK_RE = re.compile(r'(?:wait|pause|sleep)(?:\s+for)?(?:\s+(\d+(?:\.\d+)?)\s*(?:s|secs?|seconds?)?)?\W*$', re.I)
+_UNSAFE_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+_JSON_DECODER = json.JSONDecoder()
+
+# Element attributes the LLM prompts render
+_PROMPT_ATTRS = ('id', 'class', 'name', 'type', 'href', 'role')
+
+def _prompt_signature(elements: List[ElementInfo]) -> int:
+    """Hash of everything an element prompt renders, so a memoized prompt is reused only while it is still accurate"""
+    return hash(tuple(
+        (elem.index, elem.tag_name, elem.xpath, elem.text, tuple(elem.attributes.get(k) for k in _PROMPT_ATTRS))
+        for elem in elements
+    ))
+
+def _extract_json_array(text: str) -> Optional[list]:
+    """Return the first JSON array embedded in text, or None; decodes in place instead of regex-matching the span"""
+    start = text.find('[')
+    while start != -1:
+        try:
+            value, _ = _JSON_DECODER.raw_decode(text, start)
+            if isinstance(value, list):
+                return value
+        except json.JSONDecodeError:
+            pass
+        start = text.find('[', start + 1)
+    return None
+
 # AI Integration Classes
 class GeminiAI:
     """Gemini AI integration for intelligent element selection and page analysis"""
@@ -317,10 +453,14 @@ class GeminiAI:
     def __init__(self, config: Config):
         self.config = config
         self.client = None
+        self._elements_json_memo: Tuple[Optional[int], str] = (None, "")
+        # Per-instance memo: retrying an identical workflow skips the round-trip
+        self.parse_workflow = functools.lru_cache(maxsize=256)(self._parse_workflow)
         self._initialize_client()
     
     def _initialize_client(self):
         """Initialize Gemini AI client"""
+        genai = _load_genai()
         if not genai:
             logger.warning("Gemini AI not available - genai library not found")
             return
@@ -347,22 +487,11 @@ class GeminiAI:
             return {"error": "Gemini AI not available"}
         
         try:
-            # Prepare elements data for AI analysis
-            elements_data = []
-            for elem in elements[:20]:  # Limit to first 20 elements to avoid token limits
-                elements_data.append({
-                    "index": elem.index,
-                    "tag": elem.tag_name,
-                    "text": elem.text[:100],  # Limit text length
-                    "attributes": {k: v for k, v in elem.attributes.items() 
-                                 if k in ['id', 'class', 'name', 'type', 'href', 'role']}
-                })
-            
             prompt = f"""
             Analyze the following webpage elements and suggest the best action for this user intent: "{user_intent}"
             
             Available elements:
-            {json.dumps(elements_data, indent=2)}
+            {self._elements_json(elements)}
             
             Please respond with a JSON object containing:
             1. "recommended_element": The index of the best element to interact with
@@ -395,6 +524,51 @@ class GeminiAI:
             logger.error(f"AI analysis failed: {e}")
             return {"error": f"AI analysis failed: {str(e)}"}
     
+    def _elements_json(self, elements: List[ElementInfo]) -> str:
+        """JSON for the prompt's element list, reused while the first 20 elements are unchanged"""
+        shown = elements[:20]  # Limit to first 20 elements to avoid token limits
+        signature = _prompt_signature(shown)
+        if self._elements_json_memo[0] == signature:
+            return self._elements_json_memo[1]
+        
+        # Prepare elements data for AI analysis
+        elements_data = []
+        for elem in shown:
+            elements_data.append({
+                "index": elem.index,
+                "tag": elem.tag_name,
+                "text": elem.text[:100],  # Limit text length
+                "attributes": {k: v for k, v in elem.attributes.items() 
+                             if k in _PROMPT_ATTRS}
+            })
+        
+        elements_json = json.dumps(elements_data, indent=2)
+        self._elements_json_memo = (signature, elements_json)
+        return elements_json
+    
+    def _parse_workflow(self, workflow_description: str) -> Tuple[str, ...]:
+        """Ask Gemini to split a workflow into tasks; raises ValueError if the reply has no usable list
+        
+        Raising rather than returning an empty result keeps lru_cache from remembering the miss,
+        so a retry of the same description asks Gemini again.
+        """
+        prompt = f"""
+            Parse the following workflow description into a list of individual tasks:
+            
+            Workflow: {workflow_description}
+            
+            Return a JSON array of tasks, where each task is a simple, actionable instruction.
+            Example: ["Navigate to example.com", "Click login button", "Fill username field with 'user'"]
+            """
+        
+        response = self.client.generate_content(prompt)
+        
+        # Try to extract JSON array from response
+        tasks = _extract_json_array(response.text)
+        if not tasks:
+            raise ValueError("Gemini reply contained no task list")
+        return tuple(tasks)
+    
     async def suggest_element_for_task(self, elements: List[ElementInfo], task: str) -> Optional[int]:
         """Suggest the best element index for a specific task"""
         analysis = await self.analyze_page_elements(elements, task)
@@ -446,10 +620,12 @@ class AgnoAgent:
     def __init__(self, config: Config):
         self.config = config
         self.agent = None
+        self._elements_prompt_memo: Tuple[Optional[int], str] = (None, "")
         self._initialize_agent()
     
     def _initialize_agent(self):
         """Initialize Agno agent with Gemini"""
+        Agent = _load_agno_agent()
         if not Agent:
             logger.warning("Agno agent not available - missing library")
             return
@@ -460,6 +636,7 @@ class AgnoAgent:
         try:
             # Initialize with Gemini if API key is available
             if self.config.gemini_api_key and self.config.gemini_api_key != 'your_gemini_api_key_here':
+                genai = _load_genai()
                 if not genai:
                     logger.warning("Gemini AI not available - genai library not found")
                     return
@@ -654,8 +831,7 @@ class AgnoAgent:
             Available Elements (first 15):
             """
             
-            for i, elem in enumerate(elements[:15]):
-                context_prompt += f"\n{i}: <{elem.tag_name}> {elem.text[:50]} (id: {elem.attributes.get('id', 'N/A')})"
+            context_prompt += self._elements_prompt(elements)
             
             context_prompt += """
             
@@ -683,15 +859,11 @@ class AgnoAgent:
                 response_text = str(response)
             
             # Try to extract JSON from response
-            import re
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
-                try:
-                    steps = json.loads(json_match.group())
-                    logger.info(f"AI planned {len(steps)} automation steps")
-                    return steps
-                except json.JSONDecodeError:
-                    logger.warning("Failed to parse AI response as JSON")
+            steps = _extract_json_array(response_text)
+            if steps is not None:
+                logger.info(f"AI planned {len(steps)} automation steps")
+                return steps
+            logger.warning("Failed to parse AI response as JSON")
             
             # Fallback to basic planning
             return self._basic_automation_planning(user_goal, page_context, elements)
@@ -700,84 +872,35 @@ class AgnoAgent:
             logger.error(f"AI automation planning failed: {e}")
             return self._basic_automation_planning(user_goal, page_context, elements)
     
+    def _elements_prompt(self, elements: List[ElementInfo]) -> str:
+        """Element lines for the planning prompt, reused while the first 15 elements are unchanged"""
+        shown = elements[:15]
+        signature = _prompt_signature(shown)
+        if self._elements_prompt_memo[0] != signature:
+            lines = "".join(
+                f"\n{i}: <{elem.tag_name}> {elem.text[:50]} (id: {elem.attributes.get('id', 'N/A')})"
+                for i, elem in enumerate(shown)
+            )
+            self._elements_prompt_memo = (signature, lines)
+        return self._elements_prompt_memo[1]
+    
+    # (goal keyword, planner method) in priority order; the first keyword contained in the goal wins
+    _INTENT_PLANNERS = (
+        ("login", "_plan_login_steps"),
+        ("search", "_plan_search_steps"),
+        ("form", "_plan_form_steps"),
+        ("fill", "_plan_form_steps"),
+    )
+    
     def _basic_automation_planning(self, user_goal: str, page_context: Dict[str, Any], elements: List[ElementInfo]) -> List[Dict[str, Any]]:
         """Basic automation planning without AI"""
         steps = []
         goal_lower = user_goal.lower()
         
-        if "login" in goal_lower:
-            # Find username/email field
-            for elem in elements:
-                if elem.tag_name == "input" and elem.attributes.get("type") in ["email", "text"]:
-                    steps.append({
-                        "action": "fill",
-                        "target": elem.index,
-                        "value": "test_user",
-                        "description": f"Fill username field: {elem.text[:30]}",
-                        "confidence": 70
-                    })
-                    break
-            
-            # Find password field
-            for elem in elements:
-                if elem.tag_name == "input" and elem.attributes.get("type") == "password":
-                    steps.append({
-                        "action": "fill",
-                        "target": elem.index,
-                        "value": "test_password",
-                        "description": f"Fill password field: {elem.text[:30]}",
-                        "confidence": 70
-                    })
-                    break
-            
-            # Find submit button
-            for elem in elements:
-                if (elem.tag_name == "button" and "submit" in elem.text.lower()) or \
-                   (elem.tag_name == "input" and elem.attributes.get("type") == "submit"):
-                    steps.append({
-                        "action": "click",
-                        "target": elem.index,
-                        "description": f"Click submit button: {elem.text[:30]}",
-                        "confidence": 80
-                    })
-                    break
-        
-        elif "search" in goal_lower:
-            # Find search input
-            for elem in elements:
-                if elem.tag_name == "input" and ("search" in elem.attributes.get("name", "").lower() or 
-                                                "search" in elem.attributes.get("placeholder", "").lower()):
-                    steps.append({
-                        "action": "fill",
-                        "target": elem.index,
-                        "value": "test search",
-                        "description": f"Fill search field: {elem.text[:30]}",
-                        "confidence": 75
-                    })
-                    break
-            
-            # Find search button
-            for elem in elements:
-                if elem.tag_name == "button" and "search" in elem.text.lower():
-                    steps.append({
-                        "action": "click",
-                        "target": elem.index,
-                        "description": f"Click search button: {elem.text[:30]}",
-                        "confidence": 75
-                    })
-                    break
-        
-        elif "form" in goal_lower or "fill" in goal_lower:
-            # Find form inputs
-            for elem in elements:
-                if elem.tag_name == "input" and elem.attributes.get("type") in ["text", "email", "tel"]:
-                    steps.append({
-                        "action": "fill",
-                        "target": elem.index,
-                        "value": "test data",
-                        "description": f"Fill form field: {elem.text[:30]}",
-                        "confidence": 60
-                    })
+        for intent, planner in self._INTENT_PLANNERS:
+            if intent in goal_lower:
+                getattr(self, planner)(elements, steps)
+                break
         
         # Add screenshot step
         steps.append({
@@ -788,6 +911,160 @@ class AgnoAgent:
         
         return steps
 
+    def _plan_login_steps(self, elements: List[ElementInfo], steps: List[Dict[str, Any]]):
+        """Append username, password and submit steps"""
+        # Find username/email field
+        for elem in elements:
+            if elem.tag_name == "input" and elem.attributes.get("type") in ["email", "text"]:
+                steps.append({
+                    "action": "fill",
+                    "target": elem.index,
+                    "value": "test_user",
+                    "description": f"Fill username field: {elem.text[:30]}",
+                    "confidence": 70
+                })
+                break
+
+        # Find password field
+        for elem in elements:
+            if elem.tag_name == "input" and elem.attributes.get("type") == "password":
+                steps.append({
+                    "action": "fill",
+                    "target": elem.index,
+                    "value": "test_password",
+                    "description": f"Fill password field: {elem.text[:30]}",
+                    "confidence": 70
+                })
+                break
+
+        # Find submit button
+        for elem in elements:
+            if (elem.tag_name == "button" and "submit" in elem.text.lower()) or \
+               (elem.tag_name == "input" and elem.attributes.get("type") == "submit"):
+                steps.append({
+                    "action": "click",
+                    "target": elem.index,
+                    "description": f"Click submit button: {elem.text[:30]}",
+                    "confidence": 80
+                })
+                break
+
+    def _plan_search_steps(self, elements: List[ElementInfo], steps: List[Dict[str, Any]]):
+        """Append search input and search button steps"""
+        # Find search input
+        for elem in elements:
+            if elem.role == "search_input":
+                steps.append({
+                    "action": "fill",
+                    "target": elem.index,
+                    "value": "test search",
+                    "description": f"Fill search field: {elem.text[:30]}",
+                    "confidence": 75
+                })
+                break
+
+        # Find search button
+        for elem in elements:
+            if elem.role == "search_button":
+                steps.append({
+                    "action": "click",
+                    "target": elem.index,
+                    "description": f"Click search button: {elem.text[:30]}",
+                    "confidence": 75
+                })
+                break
+
+    def _plan_form_steps(self, elements: List[ElementInfo], steps: List[Dict[str, Any]]):
+        """Append a fill step for every form text input"""
+        # Find form inputs
+        for elem in elements:
+            if elem.role == "form_text_input":
+                steps.append({
+                    "action": "fill",
+                    "target": elem.index,
+                    "value": "test data",
+                    "description": f"Fill form field: {elem.text[:30]}",
+                    "confidence": 60
+                })
+
+# Bytes read from stdin but not yet handed out; _stdin_watch_ok goes False if the loop can't watch stdin
+_stdin_buffer = bytearray()
+_stdin_watch_ok = sys.platform != "win32"
+
+async def _stdin_readline() -> bytes:
+    """Read one line from stdin, waiting for it on the event loop
+    
+    The fd is only watched for readability and read with os.read once data is there, so stdin
+    keeps its blocking mode; on a tty that flag is shared with stdout and stderr.
+    """
+    loop = asyncio.get_running_loop()
+    fd = sys.stdin.fileno()
+    while b"\n" not in _stdin_buffer:
+        ready = loop.create_future()
+        loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await ready
+        finally:
+            loop.remove_reader(fd)
+        chunk = os.read(fd, 4096)
+        if not chunk:
+            break  # EOF: hand back whatever partial line is left
+        _stdin_buffer.extend(chunk)
+    end = _stdin_buffer.find(b"\n") + 1 or len(_stdin_buffer)
+    line = bytes(_stdin_buffer[:end])
+    del _stdin_buffer[:end]
+    return line
+
+async def ainput(prompt: str = "") -> str:
+    """input() that leaves the event loop free to serve page events while we wait
+    
+    On a terminal with prompt_toolkit installed, prompts natively on the event loop with line
+    editing and history. Otherwise waits for stdin on the event loop when it is a tty or pipe,
+    and failing that falls back to a daemon thread rather than asyncio.to_thread: a prompt
+    abandoned by Ctrl+C would otherwise keep asyncio.run() waiting on the default executor at shutdown.
+    """
+    global _stdin_watch_ok
+    session = _load_prompt_session()
+    if session is not None:
+        return await session.prompt_async(prompt)
+    
+    if _stdin_watch_ok:
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        try:
+            line = await _stdin_readline()
+        except (AttributeError, ValueError, OSError, NotImplementedError):
+            # Regular file, closed stdin or an event loop that can't watch fds
+            _stdin_watch_ok = False
+            prompt = ""  # already shown
+        else:
+            if not line:
+                raise EOFError
+            return line.decode(errors="replace").rstrip("\r\n")
+    
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def read():
+        try:
+            line = input(prompt)
+        except BaseException as e:  # EOFError / KeyboardInterrupt belong to the awaiting coroutine
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_exception(e))
+        else:
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(line))
+    
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
+@functools.lru_cache(maxsize=1)
+def _has_xvfb() -> bool:
+    """Check once per process whether xvfb-run is on PATH"""
+    try:
+        subprocess.check_call(['which', 'xvfb-run'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return True
+    except subprocess.CalledProcessError:
+        return False
+
 class UnifiedWebAgent:
     """Unified web browsing agent with AI integration and dual mode operation
     
@@ -809,13 +1086,38 @@ class UnifiedWebAgent:
             self.config.headless = True
         
         self.browser = None
+        self.context = None
         self.page = None
         self.state = BrowserState()
+        self._url_cache: Dict[str, str] = {}
+        self._scanned_elements: List[ElementInfo] = []
+        self._elements_by_index: Dict[int, ElementInfo] = {}
+        self._dom_token: Optional[str] = None  # DOM version seen by the last element scan
+        self._locator_cache: Dict[str, Locator] = {}  # Per page, cleared on navigation
+        self._run_ts: Optional[str] = None  # Wall-clock stamp of the current run_automation call
+        self._run_stamp = datetime.now().strftime("%Y%m%d_%H%M%S")  # Agent start, for ad-hoc screenshots
+        self._shot_counter = itertools.count(1)
+        self._disk_queue: Optional[asyncio.Queue] = None  # (path, bytes) waiting to be written
+        self._disk_writer: Optional[asyncio.Task] = None
+        
+        # Automation step action -> handler(step, elements, step_index)
+        self._step_handlers = {
+            "click": self._do_click,
+            "fill": self._do_fill,
+            "navigate": self._do_navigate,
+            "wait": self._do_wait,
+            "screenshot": self._do_screenshot,
+        }
         
-        # Initialize AI components
-        self.gemini_ai = GeminiAI(self.config)
-        self.agno_agent = AgnoAgent(self.config)
-        
+    # AI components are built on first use so modes that never call them skip the SDK imports
+    @functools.cached_property
+    def gemini_ai(self) -> GeminiAI:
+        return GeminiAI(self.config)
+    
+    @functools.cached_property
+    def agno_agent(self) -> AgnoAgent:
+        return AgnoAgent(self.config)
+    
     async def __aenter__(self):
         """Context manager entry"""
         try:
@@ -832,13 +1134,18 @@ class UnifiedWebAgent:
             }
 
             if not self.config.headless:
-                try:
-                    subprocess.check_call(['which', 'xvfb-run'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                if _has_xvfb():
                     logger.info("xvfb-run found. Launching browser with xvfb-run.")
-                except subprocess.CalledProcessError:
+                else:
                     logger.warning("xvfb-run not found. Running in non-headless mode without X server might fail.")
             
             self.browser = await self.playwright.chromium.launch(**launch_options)
+            # One shared context: stealth script and cookie jar are set up once, not per page
+            self.context = await self.create_new_context()
+            
+            # Background writer so screenshots never block a step on disk I/O
+            self._disk_queue = asyncio.Queue(maxsize=16)
+            self._disk_writer = asyncio.create_task(self._disk_worker())
             return self
         except Exception as e:
             logger.error(f"Failed to initialize browser: {e}")
@@ -846,11 +1153,26 @@ class UnifiedWebAgent:
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit"""
+        if self._disk_writer:
+            await self._disk_queue.join()  # Flush pending screenshots
+            self._disk_writer.cancel()
         if self.browser:
             await self.browser.close()
         if hasattr(self, 'playwright'):
             await self.playwright.stop()
 
+    async def reset_session(self):
+        """Swap in a fresh browser context (cookies, storage, pages) without relaunching the browser"""
+        if self.context is not None:
+            await self.context.close()
+        self.context = await self.create_new_context()
+        self.page = None
+        self.state = BrowserState()
+        self._locator_cache.clear()
+        self._scanned_elements = []
+        self._elements_by_index = {}
+        self._dom_token = None
+
     async def create_new_context(self):
         """Create a new browser context with custom settings"""
         context = await self.browser.new_context(
@@ -862,6 +1184,9 @@ class UnifiedWebAgent:
             java_script_enabled=True
         )
         
+        # Track DOM mutations so run_automation only re-scans elements when the page changed
+        await context.add_init_script(JS_DOM_VERSION_TRACKER)
+        
         # Add stealth script if automation detection is disabled
         if self.config.disable_automation:
             await context.add_init_script("""
@@ -883,23 +1208,56 @@ class UnifiedWebAgent:
 
     async def new_page(self) -> Page:
         """Create a new page with stealth settings"""
-        context = await self.create_new_context()
-        self.page = await context.new_page()
+        if self.context is None:
+            self.context = await self.create_new_context()
+        self.page = await self.context.new_page()
+        self._locator_cache.clear()
         
         self.page.on('dialog', lambda dialog: dialog.accept())
         self.page.on('pageerror', lambda error: logger.error(f"Page error: {error}"))
+        self.page.on('framenavigated', self._on_frame_navigated)
         
         return self.page
 
+    def _on_frame_navigated(self, frame):
+        """Track the main frame's URL and drop the cached title when it navigates"""
+        if frame.parent_frame is None:
+            self.state.current_url = frame.url
+            self.state.cached_title = None
+
+    async def get_title(self) -> str:
+        """Page title, cached until the next navigation or click"""
+        if self.state.cached_title is None:
+            self.state.cached_title = await self.page.title()
+        return self.state.cached_title
+
+    def locator(self, selector: str) -> Locator:
+        """Reuse one Locator per selector on the current page"""
+        loc = self._locator_cache.get(selector)
+        if loc is None:
+            # .first keeps page.click/page.fill semantics (first match, not strict mode)
+            loc = self._locator_cache[selector] = self.page.locator(selector).first
+        return loc
+
+    def resolve_url(self, url: str) -> str:
+        """Resolve a website name or bare domain to a full URL, caching the result"""
+        full_url = self._url_cache.get(url)
+        if full_url is None:
+            # Check if URL is a website name and convert to full URL
+            full_url = self.config.get_website_url(url)
+            if not full_url.startswith(('http://', 'https://')):
+                full_url = 'https://' + full_url
+            self._url_cache[url] = full_url
+        return full_url
+
     async def navigate(self, url: str, wait_for_network: bool = None):
         """Navigate to a URL with smart waiting strategy"""
         if not self.page:
             await self.new_page()
         
-        # Check if URL is a website name and convert to full URL
-        full_url = self.config.get_website_url(url)
-        if not full_url.startswith(('http://', 'https://')):
-            full_url = 'https://' + full_url
+        full_url = self.resolve_url(url)
+        self.state.cached_title = None
+        self._locator_cache.clear()
         
         if wait_for_network is None:
             wait_for_network = self.config.wait_for_network
@@ -911,13 +1269,15 @@ class UnifiedWebAgent:
                 timeout=self.config.browser_timeout
             )
             
-            await self.page.wait_for_load_state("domcontentloaded")
+            # goto() already waited for at least domcontentloaded
             self.state.current_url = self.page.url
             
-            # Store cookies and storage data
-            self.state.cookies = await self.page.context.cookies()
-            self.state.local_storage = await self.page.evaluate("() => Object.assign({}, window.localStorage)")
-            self.state.session_storage = await self.page.evaluate("() => Object.assign({}, window.sessionStorage)")
+            # Store cookies and storage data - independent reads, so fetch them concurrently
+            self.state.cookies, self.state.local_storage, self.state.session_storage = await asyncio.gather(
+                self.page.context.cookies(),
+                self.page.evaluate("() => Object.assign({}, window.localStorage)"),
+                self.page.evaluate("() => Object.assign({}, window.sessionStorage)")
+            )
             
             logger.info(f"Successfully navigated to: {self.state.current_url}")
             
@@ -925,19 +1285,62 @@ class UnifiedWebAgent:
             logger.error(f"Navigation error: {e}")
             raise
 
-    async def take_screenshot(self, path: str):
-        """Take a screenshot of the current page"""
+    async def settle(self, timeout: Optional[int] = None):
+        """Wait for the page to go network-idle instead of sleeping a fixed interval"""
+        if not self.page:
+            return
+        try:
+            await self.page.wait_for_load_state("networkidle", timeout=timeout or self.config.settle_timeout)
+        except PWTimeoutError:
+            pass  # Page still busy - carry on rather than block the step
+
+    async def _disk_worker(self):
+        """Write queued (path, bytes) pairs to disk one at a time off the event loop"""
+        while True:
+            path, data = await self._disk_queue.get()
+            try:
+                await asyncio.to_thread(Path(path).write_bytes, data)
+                self._say(f"Saved {path}")
+            except Exception as e:
+                # Keep the worker alive: __aexit__ joins the queue and needs every item marked done
+                logger.error(f"Failed to write {path}: {e}")
+            finally:
+                self._disk_queue.task_done()
+
+    async def write_file_later(self, path: str, data: bytes):
+        """Queue bytes for the background writer, or write them on a thread when it isn't running"""
+        if self._disk_writer is not None and not self._disk_writer.done():
+            await self._disk_queue.put((path, data))
+        else:
+            await asyncio.to_thread(Path(path).write_bytes, data)
+
+    def _say(self, msg: str, icon: str = "", level: int = logging.INFO):
+        """Log a message and, when verbose, echo it to stdout in one write"""
+        logger.log(level, msg)
+        if self.config.verbose:
+            sys.stdout.write(f"{icon} {msg}\n" if icon else f"{msg}\n")
+
+    def screenshot_name(self, prefix: str) -> str:
+        """Unique, sortable screenshot filename without a strftime per shot"""
+        return f"{prefix}_{self._run_stamp}_{next(self._shot_counter):03d}.png"
+
+    async def take_screenshot(self, path: str, full_page: Optional[bool] = None):
+        """Take a screenshot of the current page (viewport only unless full_page or SCREENSHOT_FULL_PAGE)"""
         if self.page:
             try:
-                screenshot_options = {'path': path, 'full_page': True}
+                if full_page is None:
+                    full_page = self.config.screenshot_full_page
+                screenshot_options = {'full_page': full_page}
                 
                 # Add quality setting for JPEG files
                 if path.lower().endswith('.jpg') or path.lower().endswith('.jpeg'):
+                    screenshot_options['type'] = 'jpeg'
                     screenshot_options['quality'] = self.config.screenshot_quality
                 
-                await self.page.screenshot(**screenshot_options)
-                logger.info(f"Screenshot saved to {path}")
-                print(f"Screenshot saved: {path}")
+                # Hand the image to the background writer
+                image = await self.page.screenshot(**screenshot_options)
+                await self.write_file_later(path, image)
+                self._say(f"Screenshot taken, writing to {path}")
             except Exception as e:
                 logger.error(f"Failed to take screenshot: {e}")
         else:
@@ -948,25 +1351,41 @@ class UnifiedWebAgent:
         if not self.page:
             raise ValueError("No page is open. Call navigate() first.")
         
-        elements_data = await self.page.evaluate(JS_GET_CLICKABLE_ELEMENTS)
+        self._dom_token, elements_data = await self.page.evaluate(JS_GET_CLICKABLE_ELEMENTS)
         
+        # Rows are positional: index, tag, text, attributes, xpath, visible, in viewport, bbox, role, preview
         elements = []
-        for data in elements_data:
-            element = ElementInfo(
-                index=data['index'],
-                tag_name=data['tagName'],
-                text=data['text'],
-                attributes=data['attributes'],
-                xpath=data['xpath'],
-                is_visible=data['isVisible'],
-                is_in_viewport=data['isInViewport'],
-                bounding_box=data['boundingBox']
-            )
-            elements.append(element)
+        for row in elements_data:
+            row[7] = tuple(row[7])
+            elements.append(ElementInfo(*row))
+        
+        self._scanned_elements = elements
+        self._elements_by_index = {e.index: e for e in elements}
         
         logger.info(f"Found {len(elements)} clickable elements")
         return elements
 
+    def get_element(self, element_index: int, elements: List[ElementInfo]) -> Optional[ElementInfo]:
+        """Look up an element by index, reusing the index built by the last scan"""
+        if elements is not self._scanned_elements:
+            self._scanned_elements = elements
+            self._elements_by_index = {e.index: e for e in elements}
+        return self._elements_by_index.get(element_index)
+
+    async def dom_changed(self) -> bool:
+        """Return True if the DOM mutated since the last element scan"""
+        try:
+            token = await self.page.evaluate("() => window.__domToken ? window.__domToken() : null")
+        except Exception:
+            return True  # Unknown state - assume changed
+        return token is None or token != self._dom_token
+
+    async def refresh_elements(self, elements: List[ElementInfo]) -> List[ElementInfo]:
+        """Re-scan clickable elements only if the DOM changed since the last scan"""
+        if await self.dom_changed():
+            return await self.find_clickable_elements()
+        return elements
+
     async def get_ai_element_suggestion(self, user_intent: str) -> Dict[str, Any]:
         """Get AI suggestion for element interaction based on user intent"""
         try:
@@ -987,7 +1406,7 @@ class UnifiedWebAgent:
             if not self.page:
                 return "No page loaded"
             
-            title = await self.page.title()
+            title = await self.get_title()
             elements = await self.find_clickable_elements()
             summary = await self.gemini_ai.generate_page_summary(title, elements)
             return summary
@@ -1003,24 +1422,17 @@ class UnifiedWebAgent:
             logger.info(f"Attempting to login to {url}")
             
             # Convert website name to URL if needed
-            full_url = self.config.get_website_url(url)
+            full_url = self.resolve_url(url)
             await self.navigate(full_url)
-            await asyncio.sleep(2)
+            await self.settle()
 
             # Special handling for GitHub
             if 'github.com' in full_url:
-                # GitHub-specific selectors
-                common_selectors = {
-                    'username': ['input[name="login"]'],
-                    'password': ['input[name="password"]'],
-                    'submit': ['input[name="commit"]', 'button[data-signin-label="Sign in"]']
-                }
-                
                 # Prompt for credentials if not provided
                 if username is None:
-                    username = input("GitHub username/email: ").strip()
+                    username = (await ainput("GitHub username/email: ")).strip()
                 if password is None:
-                    password = input("GitHub password: ").strip()
+                    password = (await ainput("GitHub password: ")).strip()
                 
                 # Take pre-login screenshot
                 await self.take_screenshot("github_pre_login.png")
@@ -1028,61 +1440,39 @@ class UnifiedWebAgent:
                 # Enhanced GitHub login flow
                 try:
                     # Find and fill username field
-                    username_field = None
-                    for selector in common_selectors['username']:
-                        try:
-                            username_field = await self.page.wait_for_selector(selector, timeout=5000)
-                            if username_field:
-                                await username_field.fill(username)
-                                break
-                        except:
-                            continue
-                    
-                    if not username_field:
+                    try:
+                        username_field = await self.page.wait_for_selector(GITHUB_LOGIN_SELECTORS['username'], timeout=5000)
+                    except PWTimeoutError:
                         raise Exception("Could not find GitHub username field")
+                    await username_field.fill(username)
                     
                     # Find and fill password field
-                    password_field = None
-                    for selector in common_selectors['password']:
-                        try:
-                            password_field = await self.page.wait_for_selector(selector, timeout=5000)
-                            if password_field:
-                                await password_field.fill(password)
-                                break
-                        except:
-                            continue
-                    
-                    if not password_field:
+                    try:
+                        password_field = await self.page.wait_for_selector(GITHUB_LOGIN_SELECTORS['password'], timeout=5000)
+                    except PWTimeoutError:
                         raise Exception("Could not find GitHub password field")
+                    await password_field.fill(password)
                     
                     # Find and click submit button
-                    submit_button = None
-                    for selector in common_selectors['submit']:
-                        try:
-                            submit_button = await self.page.wait_for_selector(selector, timeout=5000)
-                            if submit_button:
-                                await submit_button.click()
-                                break
-                        except:
-                            continue
-                    
-                    if not submit_button:
+                    try:
+                        submit_button = await self.page.wait_for_selector(GITHUB_LOGIN_SELECTORS['submit'], timeout=5000)
+                        await submit_button.click()
+                    except PWTimeoutError:
                         await password_field.press("Enter")
                     
                     # Handle potential 2FA
                     try:
                         otp_selector = 'input[name="otp"]'
                         await self.page.wait_for_selector(otp_selector, timeout=3000)
-                        otp = input("GitHub 2FA code: ").strip()
+                        otp = (await ainput("GitHub 2FA code: ")).strip()
                         otp_field = await self.page.wait_for_selector(otp_selector)
                         await otp_field.fill(otp)
                         await self.page.click('button[type="submit"]')
-                    except:
+                    except PWTimeoutError:
                         pass  # No 2FA required
                     
                     # Verify login success
                     await self.page.wait_for_load_state("networkidle")
-                    await asyncio.sleep(2)
                     
                     # Take post-login screenshot
                     await self.take_screenshot("github_post_login.png")
@@ -1094,132 +1484,72 @@ class UnifiedWebAgent:
                         return True
                     
                     return False
-
-    async def verify_login_success(self, full_url: str) -> bool:
-        """Verify if login was successful by checking multiple indicators"""
-        # Check login success indicators
-        success_indicators = [
-            ".avatar", ".user-avatar", ".profile-pic", "a[href*=\"logout\"]",
-            "a[href*=\"signout\"]", ".logout-button", ".user-menu", ".dashboard"
-        ]
-
-        # Check URL change
-        current_url = self.page.url
-        if current_url != full_url and "login" not in current_url.lower():
-            return True
-
-        # Check for success indicators
-        for selector in success_indicators:
-            try:
-                await self.page.wait_for_selector(selector, timeout=2000)
-                return True
-            except:
-                continue
-
-        return False
                 except Exception as e:
                     logger.error(f"GitHub login failed: {e}")
                     await self.take_screenshot("github_login_error.png")
                     return False
-            else:
-                # Common selectors for other websites
-                selectors = {
-                    'username': [
-                        'input[type="email"]', 'input[type="text"]', 'input[name="username"]',
-                        'input[name="email"]', 'input[id="email"]', 'input[id="username"]', 'input[name="login"]'
-                    ],
-                    'password': ['input[type="password"]', 'input[name="password"]', 'input[id="password"]'],
-                    'submit': [
-                        'button[type="submit"]', 'input[type="submit"]', 'button:has-text("Sign in")',
-                        'button:has-text("Log in")', 'button:has-text("Login")', 'input[name="commit"]'
-                    ]
-                }
 
             # Find and fill username field
-            username_field = None
-            for selector in common_selectors['username']:
-                try:
-                    username_field = await self.page.wait_for_selector(selector, timeout=2000)
-                    if username_field:
-                        break
-                except:
-                    continue
-
-            if not username_field:
+            try:
+                username_field = await self.page.wait_for_selector(COMMON_LOGIN_SELECTORS['username'], timeout=2000)
+            except PWTimeoutError:
                 logger.error("Could not find username field")
                 return False
 
             await username_field.fill(username)
-            await asyncio.sleep(1)
+            await self.settle()
 
             # Find and fill password field
-            password_field = None
-            for selector in common_selectors["password"]:
-                try:
-                    password_field = await self.page.wait_for_selector(selector, timeout=2000)
-                    if password_field:
-                        break
-                except:
-                    continue
-
-            if not password_field:
+            try:
+                password_field = await self.page.wait_for_selector(COMMON_LOGIN_SELECTORS['password'], timeout=2000)
+            except PWTimeoutError:
                 logger.error("Could not find password field")
                 return False
 
             await password_field.fill(password)
-            await asyncio.sleep(1)
+            await self.settle()
 
             # Find and click submit button
-            submit_button = None
-            for selector in common_selectors["submit"]:
-                try:
-                    submit_button = await self.page.wait_for_selector(selector, timeout=2000)
-                    if submit_button:
-                        break
-                except:
-                    continue
-
-            if submit_button:
+            try:
+                submit_button = await self.page.wait_for_selector(COMMON_LOGIN_SELECTORS['submit'], timeout=2000)
                 await submit_button.click()
-            else:
+            except PWTimeoutError:
                 await password_field.press("Enter")
 
-            await asyncio.sleep(3)
+            await self.settle()
 
             # Check login success
-            success_indicators = [
-                ".avatar", ".user-avatar", ".profile-pic", "a[href*=\"logout\"]",
-                "a[href*=\"signout\"]", ".logout-button", ".user-menu", ".dashboard"
-            ]
-
-            # Check URL change
-            current_url = self.page.url
-            if current_url != full_url and "login" not in current_url.lower():
+            if await self.verify_login_success(full_url):
                 self.state.logged_in = True
                 return True
 
-            # Check for success indicators
-            for selector in success_indicators:
-                try:
-                    await self.page.wait_for_selector(selector, timeout=2000)
-                    self.state.logged_in = True
-                    return True
-                except:
-                    continue
-
             return False
 
         except Exception as e:
             logger.error(f"Login error: {e}")
             return False
 
+    async def verify_login_success(self, full_url: str) -> bool:
+        """Verify if login was successful by checking multiple indicators"""
+        # Check URL change
+        current_url = self.page.url
+        if current_url != full_url and "login" not in current_url.lower():
+            return True
+
+        # Check for any success indicator in a single wait
+        try:
+            await self.page.wait_for_selector(LOGIN_SUCCESS_SELECTOR, timeout=2000)
+            return True
+        except PWTimeoutError:
+            return False
+
     # Additional utility methods
     async def click_element(self, element_index: int, elements: List[ElementInfo]) -> bool:
         """Click on a specific element by index with AI validation"""
         if not self.page:
             return False
         
-        element = next((e for e in elements if e.index == element_index), None)
+        element = self.get_element(element_index, elements)
         if not element:
             logger.warning(f"Element with index {element_index} not found")
             return False
@@ -1234,7 +1564,7 @@ class UnifiedWebAgent:
                     print(f"   - {warning}")
                 
                 if validation["confidence"] < 70:
-                    confirm = input("Proceed anyway? (y/N): ").strip().lower()
+                    confirm = (await ainput("Proceed anyway? (y/N): ")).strip().lower()
                     if confirm != "y":
                         print("Action cancelled by user")
                         return False
@@ -1245,37 +1575,38 @@ class UnifiedWebAgent:
             # Strategy 1: XPath
             if element.xpath and not success:
                 try:
-                    await self.page.click(f"xpath={element.xpath}")
+                    await self.locator(f"xpath={element.xpath}").click()
                     success = True
                     logger.info(f"Clicked element {element_index} using XPath")
-                except:
-                    pass
+                except PWError as e:
+                    logger.debug(f"Click via XPath failed: {e}")
             
             # Strategy 2: ID selector
             if "id" in element.attributes and not success:
                 try:
-                    await self.page.click(f"#{element.attributes['id']}")
+                    await self.locator(f"#{element.attributes['id']}").click()
                     success = True
                     logger.info(f"Clicked element {element_index} using ID selector")
-                except:
-                    pass
+                except PWError as e:
+                    logger.debug(f"Click via ID selector failed: {e}")
             
             # Strategy 3: Coordinates
-            if element.bounding_box and not success:
+            if element.bbox and not success:
                 try:
-                    x = element.bounding_box["x"] + element.bounding_box["width"] / 2
-                    y = element.bounding_box["y"] + element.bounding_box["height"] / 2
+                    x = element.bbox[0] + element.bbox[2] / 2
+                    y = element.bbox[1] + element.bbox[3] / 2
                     await self.page.mouse.click(x, y)
                     success = True
                     logger.info(f"Clicked element {element_index} using coordinates")
-                except:
-                    pass
+                except PWError as e:
+                    logger.debug(f"Click via coordinates failed: {e}")
             
             # Monitor execution
             await self.agno_agent.monitor_execution("click", success, "" if success else "All click strategies failed")
             
             if success:
-                await asyncio.sleep(2)  # Wait for potential page changes
+                self.state.cached_title = None
+                await self.settle()  # Wait for potential page changes
             
             return success
             
@@ -1287,8 +1618,6 @@ class UnifiedWebAgent:
     def generate_filename_from_url(self, url: str, prefix: str = "elements") -> str:
         """Generate a filename with timestamp and short URL name"""
         try:
-            import re
-            
             # Extract domain and path for short name
             parsed_url = urlparse(url)
             domain = parsed_url.netloc.replace("www.", "")
@@ -1301,7 +1630,7 @@ class UnifiedWebAgent:
                 short_url = domain[:30]
             
             # Remove invalid filename characters
-            short_url = re.sub(r'[<>:"/\\|?*]', "_", short_url)
+            short_url = _UNSAFE_FILENAME_RE.sub("_", short_url)
             
             # Create filename with timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1319,48 +1648,44 @@ class UnifiedWebAgent:
         if not self.page:
             return False
         
-        element = next((e for e in elements if e.index == element_index), None)
+        element = self.get_element(element_index, elements)
         if not element:
             logger.warning(f"Element with index {element_index} not found")
             return False
         
         try:
-            # Attempt to fill using different strategies
             success = False
             
-            # Strategy 1: XPath
-            if element.xpath and not success:
-                try:
-                    await self.page.fill(f"xpath={element.xpath}", value)
-                    success = True
-                    logger.info(f"Filled element {element_index} using XPath")
-                except:
-                    pass
+            # Pick one selector up front: the XPath when there is one, otherwise the ID as an
+            # attribute selector, which stays valid CSS for ids like ":r0:" or "a.b"
+            element_id = element.attributes.get("id")
+            if element.xpath:
+                selector = f"xpath={element.xpath}"
+            elif element_id:
+                escaped = element_id.replace("\\", "\\\\").replace('"', '\\"')
+                selector = f'[id="{escaped}"]'
+            else:
+                selector = None
             
-            # Strategy 2: ID selector
-            if "id" in element.attributes and not success:
+            if selector:
                 try:
-                    await self.page.fill(f"#{element.attributes['id']}", value)
+                    await self.locator(selector).fill(value, timeout=self.config.fill_timeout)
                     success = True
-                    logger.info(f"Filled element {element_index} using ID selector")
-                except:
-                    pass
-            
-            # Strategy 3: Click and type
-            if not success:
-                try:
-                    if element.bounding_box:
-                        x = element.bounding_box["x"] + element.bounding_box["width"] / 2
-                        y = element.bounding_box["y"] + element.bounding_box["height"] / 2
-                        await self.page.mouse.click(x, y)
-                        await self.page.keyboard.type(value)
-                        success = True
-                        logger.info(f"Filled element {element_index} using click and type")
-                except:
-                    pass
+                    logger.info(f"Filled element {element_index} using {selector}")
+                except PWError as e:
+                    logger.info(f"Fill via {selector} failed ({e}), falling back to click and type")
+            
+            # Fallback: click and type
+            if not success and element.bbox:
+                x = element.bbox[0] + element.bbox[2] / 2
+                y = element.bbox[1] + element.bbox[3] / 2
+                await self.page.mouse.click(x, y)
+                await self.page.keyboard.type(value)
+                success = True
+                logger.info(f"Filled element {element_index} using click and type")
             
             if success:
-                await asyncio.sleep(1)  # Wait for input to register
+                await self.settle()  # Wait for potential changes
             
             return success
             
@@ -1368,390 +1693,45 @@ class UnifiedWebAgent:
             logger.error(f"Error filling element {element_index}: {e}")
             return False
     
-    async def execute_automation_step(self, step: Dict[str, Any], elements: List[ElementInfo]) -> bool:
-        """Execute a single automation step"""
-        action = step.get("action", "")
-        target = step.get("target")
-        value = step.get("value", "")
-        description = step.get("description", "")
-        
-        logger.info(f"Executing step: {description}")
-        print(f"🤖 {description}")
-        
-        try:
-            if action == "click":
-                return await self.click_element(target, elements)
-            
-            elif action == "fill":
-                return await self.fill_element(target, value, elements)
-            
-            elif action == "navigate":
-                await self.navigate(target)
-                return True
-            
-            elif action == "wait":
-                wait_time = int(value) if value else self.config.automation_delay
-                await asyncio.sleep(wait_time)
-                return True
-            
-            elif action == "screenshot":
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"automation_{timestamp}.png"
-                await self.take_screenshot(filename)
-                return True
-            
-            else:
-                logger.warning(f"Unknown action: {action}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Failed to execute step: {e}")
-            return False
+    # Automation step handlers, dispatched through self._step_handlers
+    async def _do_click(self, step: Dict[str, Any], elements: List[ElementInfo], step_index: int) -> bool:
+        return await self.click_element(step.get("target"), elements)
     
-    async def run_automation(self, user_goal: str) -> Dict[str, Any]:
-        """Run full automation based on user goal"""
-        results = {
-            "goal": user_goal,
-            "success": False,
-            "steps_executed": 0,
-            "total_steps": 0,
-            "errors": [],
-            "screenshots": []
-        }
-        
-        try:
-            # Analyze current page
-            if not self.page:
-                results["errors"].append("No page loaded")
-                return results
-            
-            title = await self.page.title()
-            elements = await self.find_clickable_elements()
-            page_context = await self.agno_agent.analyze_page_context(
-                self.state.current_url, title, elements
-            )
-            
-            # Plan automation steps
-            print(f"🧠 Planning automation steps for: {user_goal}")
-            steps = await self.agno_agent.plan_automation_steps(user_goal, page_context, elements)
-            
-            if not steps:
-                results["errors"].append("No automation steps planned")
-                return results
-            
-            results["total_steps"] = len(steps)
-            print(f"📋 Planned {len(steps)} automation steps")
-            
-            # Execute steps
-            for i, step in enumerate(steps[:self.config.max_automation_steps]):
-                print(f"\n📍 Step {i+1}/{len(steps)}: {step.get('description', 'Unknown step')}")
-                
-                # Re-scan elements before each step (page might have changed)
-                if step.get("action") in ["click", "fill"]:
-                    elements = await self.find_clickable_elements()
-                
-                success = await self.execute_automation_step(step, elements)
-                
-                if success:
-                    results["steps_executed"] += 1
-                    print("✅ Step completed successfully")
-                    
-                    # Wait between steps
-                    await asyncio.sleep(self.config.automation_delay)
-                else:
-                    error_msg = f"Step {i+1} failed: {step.get('description', 'Unknown')}"
-                    results["errors"].append(error_msg)
-                    print(f"❌ {error_msg}")
-                    
-                    # Continue with next step instead of stopping
-                    continue
-            
-            # Final screenshot
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            final_screenshot = f"automation_final_{timestamp}.png"
-            await self.take_screenshot(final_screenshot)
-            results["screenshots"].append(final_screenshot)
-            
-            # Determine overall success
-            if results["steps_executed"] > 0:
-                results["success"] = True
-                print(f"\n🎉 Automation completed! {results['steps_executed']}/{results['total_steps']} steps executed")
-            else:
-                print(f"\n❌ Automation failed - no steps executed successfully")
-            
-        except Exception as e:
-            error_msg = f"Automation error: {str(e)}"
-            results["errors"].append(error_msg)
-            logger.error(error_msg)
-            print(f"❌ {error_msg}")
-        
-        return results
+    async def _do_fill(self, step: Dict[str, Any], elements: List[ElementInfo], step_index: int) -> bool:
+        return await self.fill_element(step.get("target"), step.get("value", ""), elements)
     
-    async def fill_element(self, element_index: int, value: str, elements: List[ElementInfo]) -> bool:
-        """Fill an input element with text"""
-        if not self.page:
-            return False
-        
-        element = next((e for e in elements if e.index == element_index), None)
-        if not element:
-            logger.warning(f"Element with index {element_index} not found")
-            return False
-        
-        try:
-            # Attempt to fill using different strategies
-            success = False
-            
-            # Strategy 1: XPath
-            if element.xpath and not success:
-                try:
-                    await self.page.fill(f"xpath={element.xpath}", value)
-                    success = True
-                    logger.info(f"Filled element {element_index} using XPath")
-                except:
-                    pass
-            
-            # Strategy 2: ID selector
-            if "id" in element.attributes and not success:
-                try:
-                    await self.page.fill(f"#{element.attributes['id']}", value)
-                    success = True
-                    logger.info(f"Filled element {element_index} using ID selector")
-                except:
-                    pass
-            
-            # Strategy 3: Click and type
-            if not success:
-                try:
-                    if element.bounding_box:
-                        x = element.bounding_box["x"] + element.bounding_box["width"] / 2
-                        y = element.bounding_box["y"] + element.bounding_box["height"] / 2
-                        await self.page.mouse.click(x, y)
-                        await self.page.keyboard.type(value)
-                        success = True
-                        logger.info(f"Filled element {element_index} using click and type")
-                except:
-                    pass
-            
-            if success:
-                await asyncio.sleep(1)  # Wait for input to register
-            
-            return success
-            
-        except Exception as e:
-            logger.error(f"Error filling element {element_index}: {e}")
-            return False
+    async def _do_navigate(self, step: Dict[str, Any], elements: List[ElementInfo], step_index: int) -> bool:
+        await self.navigate(step.get("target"))
+        return True
     
-    async def execute_automation_step(self, step: Dict[str, Any], elements: List[ElementInfo]) -> bool:
-        """Execute a single automation step"""
-        action = step.get("action", "")
-        target = step.get("target")
+    async def _do_wait(self, step: Dict[str, Any], elements: List[ElementInfo], step_index: int) -> bool:
         value = step.get("value", "")
-        description = step.get("description", "")
-        
-        logger.info(f"Executing step: {description}")
-        print(f"🤖 {description}")
-        
-        try:
-            if action == "click":
-                return await self.click_element(target, elements)
-            
-            elif action == "fill":
-                return await self.fill_element(target, value, elements)
-            
-            elif action == "navigate":
-                await self.navigate(target)
-                return True
-            
-            elif action == "wait":
-                wait_time = int(value) if value else self.config.automation_delay
-                await asyncio.sleep(wait_time)
-                return True
-            
-            elif action == "screenshot":
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"automation_{timestamp}.png"
-                await self.take_screenshot(filename)
-                return True
-            
-            else:
-                logger.warning(f"Unknown action: {action}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Failed to execute step: {e}")
-            return False
+        wait_time = int(value) if value else self.config.automation_delay
+        await asyncio.sleep(wait_time)
+        return True
     
-    async def run_automation(self, user_goal: str) -> bool:
-        """Run full automation based on user goal"""
-        try:
-            print(f"🚀 Starting automation for goal: {user_goal}")
-            
-            # Analyze current page
-            if not self.page:
-                print("❌ No page loaded. Please navigate to a website first.")
-                return False
-            
-            title = await self.page.title()
-            elements = await self.find_clickable_elements()
-            page_context = await self.agno_agent.analyze_page_context(
-                self.state.current_url, title, elements
-            )
-            
-            print(f"📄 Current page: {title}")
-            print(f"🔍 Found {len(elements)} interactive elements")
-            
-            # Plan automation steps
-            print("🧠 Planning automation steps...")
-            steps = await self.agno_agent.plan_automation_steps(user_goal, page_context, elements)
-            
-            if not steps:
-                print("❌ No automation steps could be planned")
-                return False
-            
-            print(f"📋 Planned {len(steps)} steps:")
-            for i, step in enumerate(steps, 1):
-                print(f"   {i}. {step.get('description', 'Unknown step')}")
-            
-            # Execute steps
-            print("\n🎯 Executing automation steps...")
-            success_count = 0
-            
-            for i, step in enumerate(steps, 1):
-                if i > self.config.max_automation_steps:
-                    print(f"⚠️  Reached maximum steps limit ({self.config.max_automation_steps})")
-                    break
-                
-                print(f"\n📍 Step {i}/{len(steps)}")
-                success = await self.execute_automation_step(step, elements)
-                
-                if success:
-                    success_count += 1
-                    print("✅ Step completed successfully")
-                    
-                    # Re-scan elements after each step (except screenshot)
-                    if step.get("action") not in ["screenshot", "wait"]:
-                        await asyncio.sleep(self.config.automation_delay)
-                        try:
-                            elements = await self.find_clickable_elements()
-                        except:
-                            pass  # Continue even if element scan fails
-                else:
-                    print("❌ Step failed")
-                    
-                    # Ask user if they want to continue
-                    if i < len(steps):
-                        continue_choice = input("Continue with next step? (y/N): ").strip().lower()
-                        if continue_choice != "y":
-                            break
-            
-            # Summary
-            print(f"\n📊 Automation Summary:")
-            print(f"   ✅ Successful steps: {success_count}/{len(steps)}")
-            print(f"   📄 Final page: {await self.page.title()}")
-            
-            # Take final screenshot
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            final_screenshot = f"automation_final_{timestamp}.png"
-            await self.take_screenshot(final_screenshot)
-            print(f"   📸 Final screenshot: {final_screenshot}")
-            
-            return success_count > 0
-            
-        except Exception as e:
-            logger.error(f"Automation failed: {e}")
-            print(f"❌ Automation failed: {e}")
-            return False
+    async def _do_screenshot(self, step: Dict[str, Any], elements: List[ElementInfo], step_index: int) -> bool:
+        run_ts = self._run_ts or self._run_stamp
+        filename = f"automation_screenshot_{run_ts}_{step_index:03d}.png"
+        await self.take_screenshot(filename)
+        return True
     
-    async def fill_element(self, element_index: int, value: str, elements: List[ElementInfo]) -> bool:
-        """Fill an input element with text"""
-        if not self.page:
-            return False
-        
-        element = next((e for e in elements if e.index == element_index), None)
-        if not element:
-            logger.warning(f"Element with index {element_index} not found")
-            return False
-        
-        try:
-            # Attempt to fill using different strategies
-            success = False
-            
-            # Strategy 1: XPath
-            if element.xpath and not success:
-                try:
-                    await self.page.fill(f"xpath={element.xpath}", value)
-                    success = True
-                    logger.info(f"Filled element {element_index} using XPath")
-                except:
-                    pass
-            
-            # Strategy 2: ID selector
-            if "id" in element.attributes and not success:
-                try:
-                    await self.page.fill(f"#{element.attributes['id']}", value)
-                    success = True
-                    logger.info(f"Filled element {element_index} using ID selector")
-                except:
-                    pass
-            
-            # Strategy 3: Click and type
-            if not success:
-                try:
-                    if element.bounding_box:
-                        x = element.bounding_box["x"] + element.bounding_box["width"] / 2
-                        y = element.bounding_box["y"] + element.bounding_box["height"] / 2
-                        await self.page.mouse.click(x, y)
-                        await self.page.keyboard.type(value)
-                        success = True
-                        logger.info(f"Filled element {element_index} using click and type")
-                except:
-                    pass
-            
-            if success:
-                await asyncio.sleep(1)  # Wait for potential changes
-            
-            return success
-            
-        except Exception as e:
-            logger.error(f"Error filling element {element_index}: {e}")
-            return False
-    
-    async def execute_automation_step(self, step: Dict[str, Any], elements: List[ElementInfo]) -> bool:
+    async def execute_automation_step(self, step: Dict[str, Any], elements: List[ElementInfo], step_index: int = 0) -> bool:
         """Execute a single automation step"""
-        action = step.get("action", "")
-        target = step.get("target")
-        value = step.get("value", "")
-        description = step.get("description", "")
+        return await self._dispatch_step(step.get("action", ""), step.get("description", ""), step, elements, step_index)
+    
+    async def _dispatch_step(self, action: str, description: str, step: Dict[str, Any],
+                             elements: List[ElementInfo], step_index: int) -> bool:
+        """Run an already-unpacked step through its handler"""
+        self._say(f"Executing step: {description}", "🤖")
         
-        logger.info(f"Executing step: {description}")
-        print(f"🤖 {description}")
+        handler = self._step_handlers.get(action)
+        if handler is None:
+            logger.warning(f"Unknown action: {action}")
+            return False
         
         try:
-            if action == "click":
-                return await self.click_element(target, elements)
-            
-            elif action == "fill":
-                return await self.fill_element(target, value, elements)
-            
-            elif action == "navigate":
-                await self.navigate(target)
-                return True
-            
-            elif action == "wait":
-                wait_time = int(value) if value else self.config.automation_delay
-                await asyncio.sleep(wait_time)
-                return True
-            
-            elif action == "screenshot":
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"automation_screenshot_{timestamp}.png"
-                await self.take_screenshot(filename)
-                return True
-            
-            else:
-                logger.warning(f"Unknown action: {action}")
-                return False
-                
+            return await handler(step, elements, step_index)
         except Exception as e:
             logger.error(f"Failed to execute step: {e}")
             return False
@@ -1767,19 +1747,20 @@ class UnifiedWebAgent:
             "screenshots": [],
             "output_file": output_file
         }
+        self._run_ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         try:
             # Navigate to URL if provided
             if url:
                 await self.navigate(url)
-                await asyncio.sleep(2)
+                await self.settle()
             
             # Analyze current page
             if not self.page:
                 results["errors"].append("No page loaded")
                 return results
             
-            title = await self.page.title()
+            title = await self.get_title()
             elements = await self.find_clickable_elements()
             page_context = await self.agno_agent.analyze_page_context(
                 self.state.current_url, title, elements
@@ -1797,23 +1778,36 @@ class UnifiedWebAgent:
             print(f"📋 Planned {len(steps)} automation steps")
             
             # Execute steps
-            for i, step in enumerate(steps[:self.config.max_automation_steps]):
-                print(f"\n📍 Step {i+1}/{len(steps)}: {step.get('description', 'Unknown step')}")
+            planned = steps[:self.config.max_automation_steps]
+            # Unpack every step once up front instead of re-reading the dicts inside the loop
+            actions = [step.get("action", "") for step in planned]
+            descriptions = [step.get("description", "Unknown step") for step in planned]
+            for i, step in enumerate(planned):
+                action, description = actions[i], descriptions[i]
+                next_action = actions[i + 1] if i + 1 < len(planned) else None
+                print(f"\n📍 Step {i+1}/{len(steps)}: {description}")
                 
-                # Re-scan elements before each step (page might have changed)
-                if step.get("action") in ["click", "fill"]:
-                    elements = await self.find_clickable_elements()
-                
-                success = await self.execute_automation_step(step, elements)
+                if action in ("click", "fill"):
+                    # Re-scan elements before each step, but only if the page changed
+                    elements = await self.refresh_elements(elements)
+                    success = await self._dispatch_step(action, description, step, elements, i)
+                elif action in ("wait", "screenshot") and next_action in ("click", "fill"):
+                    # These steps don't touch elements, so refresh them for the next step meanwhile
+                    success, elements = await asyncio.gather(
+                        self._dispatch_step(action, description, step, elements, i),
+                        self.refresh_elements(elements)
+                    )
+                else:
+                    success = await self._dispatch_step(action, description, step, elements, i)
                 
                 if success:
                     results["steps_executed"] += 1
                     print("✅ Step completed successfully")
                     
-                    # Wait between steps
-                    await asyncio.sleep(self.config.automation_delay)
+                    # Let the page settle before the next step
+                    await self.settle()
                 else:
-                    error_msg = f"Step {i+1} failed: {step.get('description', 'Unknown')}"
+                    error_msg = f"Step {i+1} failed: {description}"
                     results["errors"].append(error_msg)
                     print(f"❌ {error_msg}")
                     
@@ -1821,9 +1815,8 @@ class UnifiedWebAgent:
                     continue
             
             # Final screenshot
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            final_screenshot = f"automation_final_{timestamp}.png"
-            await self.take_screenshot(final_screenshot)
+            final_screenshot = f"automation_final_{self._run_ts}.png"
+            await self.take_screenshot(final_screenshot, full_page=True)
             results["screenshots"].append(final_screenshot)
             
             # Determine overall success
@@ -1834,8 +1827,7 @@ class UnifiedWebAgent:
                 # Write results to file if specified
                 if output_file:
                     try:
-                        with open(output_file, 'w') as f:
-                            json.dump(results, f, indent=2)
+                        await asyncio.to_thread(Path(output_file).write_bytes, json_bytes(results))
                         print(f"📄 Results saved to {output_file}")
                     except Exception as e:
                         error_msg = f"Failed to save results: {str(e)}"
@@ -1847,18 +1839,69 @@ class UnifiedWebAgent:
         except Exception as e:
             error_msg = f"Automation error: {str(e)}"
             results["errors"].append(error_msg)
-            logger.error(error_msg)
-            print(f"❌ {error_msg}")
+            self._say(error_msg, "❌", logging.ERROR)
         
         return results
 
+def render_menu(title: str, options, width: int) -> bytes:
+    """Render a static menu screen once, encoded for write_frame()"""
+    rule = "=" * width
+    lines = ["", rule, title, rule]
+    lines.extend(f"{key}. {label}" for key, label in options)
+    lines.extend([rule, ""])
+    return "\n".join(lines).encode()
+
+def write_frame(frame: bytes):
+    """Write a pre-encoded screen straight to the stdout fd, after anything print() still has buffered"""
+    sys.stdout.flush()
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        # stdout replaced by something without a real fd
+        sys.stdout.write(frame.decode())
+        return
+    view = memoryview(frame)
+    while view:
+        view = view[os.write(fd, view):]
+
+def render_banner(title: str, body=(), width: int = 60) -> bytes:
+    """Render a mode banner once, encoded for write_frame()"""
+    rule = "=" * width
+    lines = [rule, title, rule]
+    if body:
+        lines.extend(body)
+        lines.append(rule)
+    lines.append("")
+    return "\n".join(lines).encode()
+
+# Typed element indices are almost always small; look them up instead of calling int()
+_SMALL_INT_CACHE = {str(i): i for i in range(100)}
+
 class InteractiveBrowserController:
     """Interactive browser controller for user interaction"""
     
+    # Menu choice -> (label, handler method name); drives both the menu screen and dispatch
+    _ACTIONS = {
+        "1": ("Click element by index", "handle_click_element"),
+        "2": ("Get AI suggestion", "handle_ai_suggestion"),
+        "3": ("Navigate to URL", "handle_navigate"),
+        "4": ("Take screenshot", "handle_screenshot"),
+        "5": ("Get page summary", "handle_page_summary"),
+        "6": ("Refresh elements", "handle_find_elements"),
+        "7": ("Exit", "handle_exit"),
+    }
+    _MENU = render_menu(
+        "🤖 AI Web Agent - Choose an action:",
+        ((key, label) for key, (label, _) in _ACTIONS.items()),
+        50,
+    )
+    
     def __init__(self, agent: UnifiedWebAgent):
         self.agent = agent
         self.current_elements = []
         self.running = True
+        # Rendered element listings by line limit, valid until the next element scan
+        self._listing_cache: Dict[int, str] = {}
     
     async def start_interactive_session(self):
         """Start the interactive browsing session"""
@@ -1874,34 +1917,13 @@ class InteractiveBrowserController:
         """Main interactive command loop"""
         while self.running:
             try:
-                print("\n" + "="*50)
-                print("🤖 AI Web Agent - Choose an action:")
-                print("1. Click element by index")
-                print("2. Get AI suggestion")
-                print("3. Navigate to URL")
-                print("4. Take screenshot")
-                print("5. Get page summary")
-                print("6. Refresh elements")
-                print("7. Exit")
-                print("="*50)
+                write_frame(self._MENU)
                 
-                choice = input("Enter choice (1-7): ").strip()
+                choice = (await ainput("Enter choice (1-7): ")).strip()
                 
-                if choice == "1":
-                    await self.handle_click_element()
-                elif choice == "2":
-                    await self.handle_ai_suggestion()
-                elif choice == "3":
-                    await self.handle_navigate()
-                elif choice == "4":
-                    await self.handle_screenshot()
-                elif choice == "5":
-                    await self.handle_page_summary()
-                elif choice == "6":
-                    await self.handle_find_elements()
-                elif choice == "7":
-                    print("👋 Goodbye!")
-                    self.running = False
+                action = self._ACTIONS.get(choice)
+                if action:
+                    await getattr(self, action[1])()
                 else:
                     print("❌ Invalid choice. Please try again.")
 
@@ -1914,11 +1936,16 @@ class InteractiveBrowserController:
             except Exception as e:
                 print(f"❌ An error occurred: {e}")
                 logger.error(f"Interactive loop error: {e}")
-                choice = input("Continue (c) or Exit (e)? ").strip().lower()
+                choice = (await ainput("Continue (c) or Exit (e)? ")).strip().lower()
                 if choice == "e":
                     break
         self.running = False
 
+    async def handle_exit(self):
+        """Handle leaving the interactive session"""
+        print("👋 Goodbye!")
+        self.running = False
+
     async def handle_find_elements(self):
         """Handle finding clickable elements"""
         if not self.agent.page:
@@ -1928,19 +1955,17 @@ class InteractiveBrowserController:
         try:
             print("🔍 Searching for clickable elements...")
             self.current_elements = await self.agent.find_clickable_elements()
+            self._listing_cache.clear()
             print(f"✅ Found {len(self.current_elements)} clickable elements")
 
             # Auto-save elements to file with timestamp and short URL
             if self.current_elements:
                 await self.auto_save_elements()
 
-                print("\n📋 Available elements:")
-                for elem in self.current_elements[:10]:  # Show first 10
-                    text_preview = elem.text[:50] + "..." if len(elem.text) > 50 else elem.text
-                    print(f"  [{elem.index}] <{elem.tag_name}> - {text_preview}")
-                
-                if len(self.current_elements) > 10:
-                    print(f"  ... and {len(self.current_elements) - 10} more elements")
+                # Show first 10, written in one go with the header and overflow line
+                remaining = len(self.current_elements) - 10
+                tail = f"\n  ... and {remaining} more elements" if remaining > 0 else ""
+                sys.stdout.write(f"\n📋 Available elements:\n{self.element_listing(10)}{tail}\n")
             else:
                 print("ℹ️  No clickable elements found on this page")
 
@@ -1948,6 +1973,15 @@ class InteractiveBrowserController:
             print(f"❌ Failed to find elements: {e}")
             logger.error(f"Error finding elements: {e}")
 
+    def element_listing(self, limit: int) -> str:
+        """Lines for the first `limit` elements, rendered once per element scan"""
+        listing = self._listing_cache.get(limit)
+        if listing is None:
+            listing = self._listing_cache[limit] = "\n".join(
+                f"  [{elem.index}] <{elem.tag_name}> - {elem.preview}" for elem in itertools.islice(self.current_elements, limit)
+            )
+        return listing
+
     async def auto_save_elements(self):
         """Automatically save elements with timestamp and short URL name"""
         try:
@@ -1958,12 +1992,12 @@ class InteractiveBrowserController:
             # Create analysis object and save
             analysis = PageAnalysis(
                 url=current_url,
-                title=await self.agent.page.title() if self.agent.page else "Unknown",
+                title=await self.agent.get_title() if self.agent.page else "Unknown",
                 timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 elements=self.current_elements
             )
             
-            analysis.save_to_file(filename)
+            await asyncio.to_thread(analysis.save_to_file, filename)
             print(f"💾 AUTO-SAVED: Elements saved to {filename}")
             
         except Exception as e:
@@ -1975,28 +2009,28 @@ class InteractiveBrowserController:
             print("❌ No clickable elements found. Please refresh elements first.")
             return
 
-        print(f"\n📋 Available elements (0-{len(self.current_elements) - 1}):")
-        for elem in self.current_elements[:15]:  # Show first 15
-            text_preview = elem.text[:60] + "..." if len(elem.text) > 60 else elem.text
-            print(f"  [{elem.index}] <{elem.tag_name}> - {text_preview}")
+        # Show first 15
+        sys.stdout.write(f"\n📋 Available elements (0-{len(self.current_elements) - 1}):\n{self.element_listing(15)}\n")
 
         try:
-            index_input = input("\nEnter element index to click: ").strip()
-            element_index = int(index_input)
+            index_input = (await ainput("\nEnter element index to click: ")).strip()
+            element_index = _SMALL_INT_CACHE.get(index_input)
+            if element_index is None:
+                element_index = int(index_input)
             
             # Find the specific element from the list
-            element_to_click = next((elem for elem in self.current_elements if elem.index == element_index), None)
+            element_to_click = self.agent.get_element(element_index, self.current_elements)
 
             if element_to_click is None:
                 print(f"❌ Invalid index. Please enter a number between 0 and {len(self.current_elements) - 1}.")
                 return
 
-            print(f"🖱️  Clicking element [{element_index}]: <{element_to_click.tag_name}> - {element_to_click.text[:50]}")
+            print(f"🖱️  Clicking element [{element_index}]: <{element_to_click.tag_name}> - {element_to_click.preview}")
             
             success = await self.agent.click_element(element_index, self.current_elements)
             if success:
                 print("✅ Element clicked successfully!")
-                await asyncio.sleep(3)  # Wait for page to potentially load
+                await self.agent.settle()  # Wait for page to potentially load
                 print("🔄 Re-scanning for elements...")
                 await self.handle_find_elements()
             else:
@@ -2014,7 +2048,7 @@ class InteractiveBrowserController:
             print("❌ No elements available. Please refresh elements first.")
             return
         
-        user_intent = input("🤖 What would you like to do? (e.g., login, search, click submit): ").strip()
+        user_intent = (await ainput("🤖 What would you like to do? (e.g., login, search, click submit): ")).strip()
         if not user_intent:
             print("❌ Please provide a valid intent.")
             return
@@ -2027,20 +2061,22 @@ class InteractiveBrowserController:
                 print(f"❌ AI suggestion failed: {suggestion['error']}")
                 return
             
-            print(f"🎯 AI Recommendation:")
-            print(f"   Element: {suggestion.get('recommended_element', None)}")
-            print(f"   Confidence: {suggestion.get('confidence', 0)}%")
-            print(f"   Action: {suggestion.get('action_type', 'Unknown')}")
-            print(f"   Reasoning: {suggestion.get('reasoning', 'No reasoning provided')}")
+            sys.stdout.write(
+                "🎯 AI Recommendation:\n"
+                f"   Element: {suggestion.get('recommended_element', None)}\n"
+                f"   Confidence: {suggestion.get('confidence', 0)}%\n"
+                f"   Action: {suggestion.get('action_type', 'Unknown')}\n"
+                f"   Reasoning: {suggestion.get('reasoning', 'No reasoning provided')}\n"
+            )
             
             if suggestion.get('recommended_element', -1) >= 0:
-                proceed = input("🤔 Would you like to execute this suggestion? (y/N): ").strip().lower()
+                proceed = (await ainput("🤔 Would you like to execute this suggestion? (y/N): ")).strip().lower()
                 if proceed == "y":
                     element_index = suggestion['recommended_element']
                     success = await self.agent.click_element(element_index, self.current_elements)
                     if success:
                         print("✅ AI suggestion executed successfully!")
-                        await asyncio.sleep(3)
+                        await self.agent.settle()
                         await self.handle_find_elements()
                     else:
                         print("❌ Failed to execute AI suggestion.")
@@ -2051,7 +2087,7 @@ class InteractiveBrowserController:
 
     async def handle_navigate(self):
         """Handle navigation to a new URL"""
-        url = input("🌐 Enter URL or website name (e.g., github, google.com): ").strip()
+        url = (await ainput("🌐 Enter URL or website name (e.g., github, google.com): ")).strip()
         if not url:
             print("❌ Please provide a valid URL.")
             return
@@ -2071,12 +2107,11 @@ class InteractiveBrowserController:
     async def handle_screenshot(self):
         """Handle taking a screenshot"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"screenshot_{timestamp}.png"
+            filename = self.agent.screenshot_name("screenshot")
             
             print(f"📸 Taking screenshot...")
             await self.agent.take_screenshot(filename)
-            print(f"✅ Screenshot saved as: {filename}")
+            print(f"✅ Screenshot taken: {filename}")
             
         except Exception as e:
             print(f"❌ Screenshot failed: {e}")
@@ -2087,27 +2122,65 @@ class InteractiveBrowserController:
         try:
             print("🧠 Generating AI page summary...")
             summary = await self.agent.get_page_summary()
-            print(f"📄 Page Summary:")
-            print(f"   {summary}")
+            sys.stdout.write(f"📄 Page Summary:\n   {summary}\n")
             
         except Exception as e:
             print(f"❌ Page summary failed: {e}")
             logger.error(f"Page summary error: {e}")
 
+# Mode banners, rendered once at import
+_INTERACTIVE_BANNER = render_banner("🤖 UNIFIED WEB AGENT - INTERACTIVE MODE")
+_LOGIN_BANNER = render_banner("🔐 UNIFIED WEB AGENT - LOGIN MODE")
+_TEST_BANNER = render_banner("🧪 UNIFIED WEB AGENT - TEST MODE")
+_AUTOMATED_BANNER = render_banner(
+    "🤖 UNIFIED WEB AGENT - AUTOMATED MODE",
+    (
+        "1. 🌐 Single Task Automation",
+        "2. 🔄 Full Workflow Automation",
+        "3. ❌ Back to Main Menu",
+    ),
+)
+_SINGLE_TASK_BANNER = render_banner(
+    "🤖 SINGLE TASK AUTOMATION",
+    (
+        "Examples:",
+        "  - 'navigate to github.com'",
+        "  - 'login to github with user test and password pass'",
+        "  - 'search for python tutorials'",
+        "  - 'fill out the contact form'",
+    ),
+)
+_WORKFLOW_BANNER = render_banner(
+    "🤖 FULL WORKFLOW AUTOMATION",
+    (
+        "This mode will automatically execute a complete workflow",
+        "without requiring step-by-step user input.",
+    ),
+)
+
 # Main execution functions
-async def run_interactive_mode():
+@contextlib.asynccontextmanager
+async def _mode_agent(agent: Optional[UnifiedWebAgent]):
+    """Yield the shared agent with a fresh session, or a private one when none is shared"""
+    if agent is not None:
+        if agent.page is not None:
+            await agent.reset_session()
+        yield agent
+    else:
+        async with UnifiedWebAgent() as own_agent:
+            yield own_agent
+
+async def run_interactive_mode(agent: Optional[UnifiedWebAgent] = None):
     """Run the interactive web browsing mode"""
-    print("=" * 60)
-    print("🤖 UNIFIED WEB AGENT - INTERACTIVE MODE")
-    print("=" * 60)
+    write_frame(_INTERACTIVE_BANNER)
     
     # Get initial URL from user
-    url = input("🌐 Enter starting URL or website name (or press Enter for test site): ").strip()
+    url = (await ainput("🌐 Enter starting URL or website name (or press Enter for test site): ")).strip()
     if not url:
         url = os.getenv("TEST_URL", "https://httpbin.org/forms/post")
         print(f"Using test URL: {url}")
         
-    async with UnifiedWebAgent() as agent:
+    async with _mode_agent(agent) as agent:
         try:
             # Navigate to initial URL
             await agent.navigate(url)
@@ -2121,22 +2194,20 @@ async def run_interactive_mode():
             print(f"❌ Failed to start interactive mode: {e}")
             logger.error(f"Interactive mode error: {e}")
 
-async def run_login_mode():
+async def run_login_mode(agent: Optional[UnifiedWebAgent] = None):
     """Run the login mode"""
-    print("=" * 60)
-    print("🔐 UNIFIED WEB AGENT - LOGIN MODE")
-    print("=" * 60)
+    write_frame(_LOGIN_BANNER)
     
     # Get login credentials from user
-    url = input("🌐 Enter website URL or name (e.g., github, google): ").strip()
-    username = input("👤 Enter username/email: ").strip()
-    password = input("🔒 Enter password: ").strip()
+    url = (await ainput("🌐 Enter website URL or name (e.g., github, google): ")).strip()
+    username = (await ainput("👤 Enter username/email: ")).strip()
+    password = (await ainput("🔒 Enter password: ")).strip()
     
     if not all([url, username, password]):
         print("❌ All fields are required for login.")
         return
         
-    async with UnifiedWebAgent() as agent:
+    async with _mode_agent(agent) as agent:
         try:
             # Attempt to log in
             print(f"🔐 Attempting login to {url}...")
@@ -2157,27 +2228,13 @@ async def run_login_mode():
             print(f"❌ Login error: {e}")
             logger.error(f"Login error: {e}")
 
-def show_main_menu():
-    """Show the main menu with dual mode options"""
-    print("\n" + "=" * 60)
-    print("🤖 UNIFIED WEB AGENT - DUAL MODE")
-    print("=" * 60)
-    print("1. 🌐 Interactive Browsing Mode")
-    print("2. 🤖 Automated Mode (Gemini AI)")
-    print("3. 🔐 Login Mode")
-    print("4. 🧪 Test Mode (Demo)")
-    print("5. ❌ Exit")
-    print("=" * 60)
-
-async def run_test_mode():
+async def run_test_mode(agent: Optional[UnifiedWebAgent] = None):
     """Run test mode with demo functionality"""
-    print("=" * 60)
-    print("🧪 UNIFIED WEB AGENT - TEST MODE")
-    print("=" * 60)
+    write_frame(_TEST_BANNER)
     
     test_url = os.getenv("TEST_URL", "https://httpbin.org/forms/post")
     
-    async with UnifiedWebAgent() as agent:
+    async with _mode_agent(agent) as agent:
         try:
             print(f"🚀 Navigating to test site: {test_url}")
             await agent.navigate(test_url)
@@ -2204,53 +2261,39 @@ async def run_test_mode():
             print(f"❌ Test mode failed: {e}")
             logger.error(f"Test mode error: {e}")
 
-async def run_automated_mode():
+async def run_automated_mode(agent: Optional[UnifiedWebAgent] = None):
     """Run the automated web browsing mode with natural language"""
-    print("=" * 60)
-    print("🤖 UNIFIED WEB AGENT - AUTOMATED MODE")
-    print("=" * 60)
-    print("1. 🌐 Single Task Automation")
-    print("2. 🔄 Full Workflow Automation")
-    print("3. ❌ Back to Main Menu")
-    print("=" * 60)
+    write_frame(_AUTOMATED_BANNER)
     
-    choice = input("Choose option (1-3): ").strip()
+    choice = (await ainput("Choose option (1-3): ")).strip()
     
     if choice == "1":
-        await run_single_task_automation()
+        await run_single_task_automation(agent)
     elif choice == "2":
-        await run_full_workflow_automation()
+        await run_full_workflow_automation(agent)
     elif choice == "3":
         return
     else:
         print("❌ Invalid choice. Returning to main menu.")
 
-async def run_single_task_automation():
+async def run_single_task_automation(agent: Optional[UnifiedWebAgent] = None):
     """Run automation for a single natural language task"""
-    print("=" * 60)
-    print("🤖 SINGLE TASK AUTOMATION")
-    print("=" * 60)
-    print("Examples:")
-    print("  - 'navigate to github.com'")
-    print("  - 'login to github with user test and password pass'")
-    print("  - 'search for python tutorials'")
-    print("  - 'fill out the contact form'")
-    print("=" * 60)
+    write_frame(_SINGLE_TASK_BANNER)
     
     # Get URL and task from user
-    url = input("🌐 Enter starting URL (or press Enter for test site): ").strip()
+    url = (await ainput("🌐 Enter starting URL (or press Enter for test site): ")).strip()
     if not url:
         url = os.getenv("TEST_URL", "https://httpbin.org/forms/post")
         print(f"Using test URL: {url}")
     
-    task = input("💬 Enter the task to automate: ").strip()
+    task = (await ainput("💬 Enter the task to automate: ")).strip()
     if not task:
         print("❌ No task specified. Returning to main menu.")
         return
     
-    output_file = input("💾 Enter output file path (optional): ").strip()
+    output_file = (await ainput("💾 Enter output file path (optional): ")).strip()
     
-    async with UnifiedWebAgent() as agent:
+    async with _mode_agent(agent) as agent:
         try:
             # Navigate to the URL
             await agent.navigate(url)
@@ -2272,29 +2315,24 @@ async def run_single_task_automation():
                 if results["errors"]:
                     print(f"   Errors: {'; '.join(results['errors'])}")
             
-            input("\nPress Enter to continue...")
+            await ainput("\nPress Enter to continue...")
             
         except Exception as e:
             print(f"❌ Automation failed: {e}")
             logger.error(f"Automation error: {e}")
-            input("\nPress Enter to continue...")
+            await ainput("\nPress Enter to continue...")
 
-async def run_full_workflow_automation():
+async def run_full_workflow_automation(agent: Optional[UnifiedWebAgent] = None):
     """Run fully automated workflow without user intervention"""
-    print("=" * 60)
-    print("🤖 FULL WORKFLOW AUTOMATION")
-    print("=" * 60)
-    print("This mode will automatically execute a complete workflow")
-    print("without requiring step-by-step user input.")
-    print("=" * 60)
+    write_frame(_WORKFLOW_BANNER)
     
     # Get workflow details
-    url = input("🌐 Enter starting URL: ").strip()
+    url = (await ainput("🌐 Enter starting URL: ")).strip()
     if not url:
         print("❌ URL is required for full automation. Returning to main menu.")
         return
     
-    workflow_description = input("📝 Describe the complete workflow to automate: ").strip()
+    workflow_description = (await ainput("📝 Describe the complete workflow to automate: ")).strip()
     if not workflow_description:
         print("❌ Workflow description is required. Returning to main menu.")
         return
@@ -2302,21 +2340,22 @@ async def run_full_workflow_automation():
     print("\n📋 Workflow Summary:")
     print(f"   Starting URL: {url}")
     print(f"   Workflow: {workflow_description}")
-    confirm = input("\nStart automation? (y/N): ").strip().lower()
+    confirm = (await ainput("\nStart automation? (y/N): ")).strip().lower()
     
     if confirm != "y":
         print("❌ Automation cancelled. Returning to main menu.")
         return
     
-    async with UnifiedWebAgent() as agent:
+    async with _mode_agent(agent) as agent:
         try:
             # Navigate to the starting URL
             print(f"🌐 Navigating to starting URL: {url}")
             await agent.navigate(url)
             print(f"✅ Successfully loaded: {agent.state.current_url}")
             
-            # Parse workflow into individual tasks
+            # Parse workflow into individual tasks and classify each one up front
             tasks = await parse_workflow_into_tasks(agent, workflow_description)
+            classified = [classify_workflow_task(task, agent.config) for task in tasks]
             
             print(f"📋 Parsed workflow into {len(tasks)} tasks:")
             for i, task in enumerate(tasks, 1):
@@ -2325,86 +2364,91 @@ async def run_full_workflow_automation():
             # Execute each task in sequence
             print("\n🚀 Starting automated workflow execution...")
             
-            for i, task in enumerate(tasks, 1):
+            # Each handler settles the page itself, so tasks follow each other without a fixed pause
+            for i, (task, (kind, payload)) in enumerate(zip(tasks, classified), 1):
                 print(f"\n📍 Task {i}/{len(tasks)}: {task}")
-                
-                # Check if task is a navigation command
-                if any(keyword in task.lower() for keyword in ['navigate to', 'go to', 'visit', 'open']):
-                    url = extract_url_from_command(task, agent.config)
-                    if url:
-                        print(f"🌐 Navigating to {url}...")
-                        await agent.navigate(url)
-                        await asyncio.sleep(2)
-                        print(f"✅ Successfully navigated to: {agent.state.current_url}")
-                        continue
-                
-                # Execute the task
-                results = await agent.run_automation(task)
-                
-                # Check results
-                if results["success"]:
-                    print(f"✅ Task completed successfully!")
-                else:
-                    print(f"⚠️ Task had issues: {'; '.join(results.get('errors', ['Unknown error']))}")
-                    retry = input("Retry this task? (y/N): ").strip().lower()
-                    if retry == "y":
-                        print("🔄 Retrying task...")
-                        results = await agent.run_automation(task)
-                        if not results["success"]:
-                            print("❌ Task failed again. Continuing with next task...")
-                
-                # Take a screenshot after each task
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_name = f"workflow_task{i}_{timestamp}.png"
-                await agent.take_screenshot(screenshot_name)
-                print(f"📸 Screenshot saved: {screenshot_name}")
-                
-                # Wait between tasks
-                await asyncio.sleep(agent.config.automation_delay)
+                await _WORKFLOW_HANDLERS[kind](agent, payload, i)
             
             # Final screenshot
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            final_screenshot = f"workflow_final_{timestamp}.png"
+            final_screenshot = agent.screenshot_name("workflow_final")
             await agent.take_screenshot(final_screenshot)
             
             print("\n🎉 Workflow automation completed!")
             print(f"📸 Final screenshot: {final_screenshot}")
             
-            input("\nPress Enter to continue...")
+            await ainput("\nPress Enter to continue...")
             
         except Exception as e:
             print(f"❌ Workflow automation failed: {e}")
             logger.error(f"Workflow automation error: {e}")
-            input("\nPress Enter to continue...")
+            await ainput("\nPress Enter to continue...")
+
+def classify_workflow_task(task: str, config) -> Tuple[str, Any]:
+    """Classify a workflow task once as ("nav", url), ("wait", seconds or None) or ("action", task)"""
+    lowered = task.lstrip().lower()
+    if lowered.startswith(_NAV_PREFIXES):
+        url = extract_url_from_command(task, config)
+        if url:
+            return "nav", url
+    wait_match = _WAIT_TASK_RE.match(lowered)
+    if wait_match:
+        seconds = wait_match.group(1)
+        return "wait", float(seconds) if seconds else None
+    return "action", task
+
+async def _workflow_nav(agent, url: str, index: int):
+    """Workflow task that navigates straight to a URL"""
+    print(f"🌐 Navigating to {url}...")
+    await agent.navigate(url)
+    await agent.settle()
+    print(f"✅ Successfully navigated to: {agent.state.current_url}")
+
+async def _workflow_wait(agent, seconds: Optional[float], index: int):
+    """Workflow task that pauses; without an explicit duration, wait for the page to settle"""
+    if seconds is None:
+        await agent.settle()
+    else:
+        print(f"⏳ Waiting {seconds:g} seconds...")
+        await asyncio.sleep(seconds)
+
+async def _workflow_action(agent, task: str, index: int):
+    """Workflow task handed to the automation planner, with an optional retry and a screenshot"""
+    results = await agent.run_automation(task)
+    
+    # Check results
+    if results["success"]:
+        print(f"✅ Task completed successfully!")
+    else:
+        print(f"⚠️ Task had issues: {'; '.join(results.get('errors', ['Unknown error']))}")
+        retry = (await ainput("Retry this task? (y/N): ")).strip().lower()
+        if retry == "y":
+            print("🔄 Retrying task...")
+            results = await agent.run_automation(task)
+            if not results["success"]:
+                print("❌ Task failed again. Continuing with next task...")
+    
+    # Take a screenshot after each task
+    screenshot_name = agent.screenshot_name(f"workflow_task{index}")
+    await agent.take_screenshot(screenshot_name)
+    print(f"📸 Screenshot taken: {screenshot_name}")
+    
+    # Let the page settle before the next task
+    await agent.settle()
+
+_WORKFLOW_HANDLERS = {
+    "nav": _workflow_nav,
+    "wait": _workflow_wait,
+    "action": _workflow_action,
+}
 
 async def parse_workflow_into_tasks(agent, workflow_description):
     """Parse a workflow description into individual tasks using AI"""
     try:
-        # First try to use Gemini AI if available
-        if agent.gemini_ai.client:
-            prompt = f"""
-            Parse the following workflow description into a list of individual tasks:
-            
-            Workflow: {workflow_description}
-            
-            Return a JSON array of tasks, where each task is a simple, actionable instruction.
-            Example: ["Navigate to example.com", "Click login button", "Fill username field with 'user'"]
-            """
-            
-            response = agent.gemini_ai.client.generate_content(prompt)
-            
-            # Try to extract JSON array from response
-            import re
-            import json
-            
-            json_match = re.search(r'\[.*\]', response.text, re.DOTALL)
-            if json_match:
-                try:
-                    tasks = json.loads(json_match.group())
-                    if isinstance(tasks, list) and len(tasks) > 0:
-                        return tasks
-                except:
-                    pass
+        # First try to use Gemini AI if available; short descriptions don't need it
+        if agent.gemini_ai.client and len(workflow_description) >= 40:
+            # Raises when Gemini returns no usable list, which lands in the fallback below
+            tasks = await asyncio.to_thread(agent.gemini_ai.parse_workflow, workflow_description)
+            return list(tasks)
         
         # Fallback to simple parsing
         return fallback_workflow_parsing(workflow_description)
@@ -2413,57 +2457,96 @@ async def parse_workflow_into_tasks(agent, workflow_description):
         logger.error(f"Error parsing workflow: {e}")
         return fallback_workflow_parsing(workflow_description)
 
+def _split_multi(text: str, seps: str) -> List[str]:
+    """Split text on any of the single-character separators in seps"""
+    for sep in seps[1:]:
+        text = text.replace(sep, seps[0])
+    return text.split(seps[0])
+
+# Lowercases ASCII letters only, so indexes into the lowered text still line up with the original
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+def _split_on_words(text: str, words: Tuple[str, ...]) -> List[str]:
+    """Split text on any of the space-padded ASCII words, case-insensitively"""
+    text = " ".join(text.split())  # Collapse whitespace runs so ' and ' matches any spacing
+    lowered = text.translate(_ASCII_LOWER)
+    
+    parts = []
+    start = 0
+    while True:
+        hits = [(pos, word) for word in words if (pos := lowered.find(word, start)) != -1]
+        if not hits:
+            break
+        pos, word = min(hits)
+        parts.append(text[start:pos])
+        start = pos + len(word)
+    parts.append(text[start:])
+    return parts
+
 def fallback_workflow_parsing(workflow_description):
     """Fallback method to parse workflow description into tasks"""
     # Split by common separators
     tasks = []
     
     # Try to split by numbered items like "1.", "2.", etc.
-    if re.search(r'\d+\.', workflow_description):
-        parts = re.split(r'\d+\.', workflow_description)
+    if _RE_NUM.search(workflow_description):
+        parts = _RE_NUM.split(workflow_description)
         tasks = [part.strip() for part in parts if part.strip()]
     
-    # If that didn't work, try splitting by periods, commas, or semicolons
-    elif len(tasks) == 0:
-        parts = re.split(r'[.;]', workflow_description)
+    # If that didn't work, try splitting by periods or semicolons
+    if not tasks:
+        parts = _split_multi(workflow_description, ';.')
         tasks = [part.strip() for part in parts if part.strip()]
     
-    # If still no tasks, try splitting by "and" or "then"
-    elif len(tasks) == 0:
-        parts = re.split(r'\s+(?:and|then)\s+', workflow_description, flags=re.IGNORECASE)
+    # If that left a single task, try splitting it by "and" or "then"
+    if len(tasks) == 1:
+        parts = _split_on_words(tasks[0], (' and ', ' then '))
         tasks = [part.strip() for part in parts if part.strip()]
     
     # If all else fails, use the whole description as one task
-    if len(tasks) == 0:
+    if not tasks:
         tasks = [workflow_description]
     
     return tasks
 
 def extract_url_from_command(command: str, config) -> str:
     """Extract URL from natural language command"""
-    import re
-    
     # Look for explicit URLs
-    url_pattern = r'https?://[^\s]+'
-    urls = re.findall(url_pattern, command)
-    if urls:
-        return urls[0]
+    url_match = _URL_RE.search(command)
+    if url_match:
+        return url_match.group()
     
-    # Look for website names
+    # Look for website names right after a navigation word
     words = command.lower().split()
-    for i, word in enumerate(words):
-        if word in ['to', 'visit', 'open', 'navigate']:
-            if i + 1 < len(words):
-                potential_site = words[i + 1]
-                # Check if it's a known website
-                if potential_site in config.website_urls:
-                    return config.website_urls[potential_site]
-                # Check if it looks like a domain
-                if '.' in potential_site or potential_site.endswith('.com'):
-                    return potential_site
+    for word, potential_site in zip(words, words[1:]):
+        if word in _NAV_TRIGGERS:
+            # Check if it's a known website
+            if potential_site in config.website_urls:
+                return config.website_urls[potential_site]
+            # Check if it looks like a domain
+            if '.' in potential_site:
+                return potential_site
     
     return None
 
+# Main menu choice -> (label, mode runner); a None runner exits
+_MAIN_MODES = {
+    "1": ("🌐 Interactive Browsing Mode", run_interactive_mode),
+    "2": ("🤖 Automated Mode (Gemini AI)", run_automated_mode),
+    "3": ("🔐 Login Mode", run_login_mode),
+    "4": ("🧪 Test Mode (Demo)", run_test_mode),
+    "5": ("❌ Exit", None),
+}
+_MAIN_MENU = render_menu(
+    "🤖 UNIFIED WEB AGENT - DUAL MODE",
+    ((key, label) for key, (label, _) in _MAIN_MODES.items()),
+    60,
+)
+
+def show_main_menu():
+    """Show the main menu with dual mode options"""
+    write_frame(_MAIN_MENU)
+
 async def main():
     """Main function"""
     print("🚀 Starting Unified Web Agent...")
@@ -2484,32 +2567,36 @@ async def main():
             await run_login_mode()
             return
     
-    # Interactive menu mode
-    while True:
-        try:
-            show_main_menu()
-            choice = input("Choose option (1-5): ").strip()
-            
-            if choice == "1":
-                await run_interactive_mode()
-            elif choice == "2":
-                await run_automated_mode()
-            elif choice == "3":
-                await run_login_mode()
-            elif choice == "4":
-                await run_test_mode()
-            elif choice == "5":
-                print("👋 Goodbye!")
-                break
-            else:
-                print("❌ Invalid choice. Please try again.")
+    # Interactive menu mode - one browser, launched on first use, shared by every mode
+    async with contextlib.AsyncExitStack() as stack:
+        agent = None
+        
+        async def shared_agent() -> UnifiedWebAgent:
+            nonlocal agent
+            if agent is None:
+                agent = await stack.enter_async_context(UnifiedWebAgent())
+            return agent
+        
+        while True:
+            try:
+                show_main_menu()
+                choice = (await ainput("Choose option (1-5): ")).strip()
                 
-        except KeyboardInterrupt:
-            print("\n👋 Goodbye!")
-            break
-        except Exception as e:
-            print(f"❌ An error occurred: {e}")
-            logger.error(f"Main loop error: {e}")
+                mode = _MAIN_MODES.get(choice)
+                if mode is None:
+                    print("❌ Invalid choice. Please try again.")
+                elif mode[1] is None:
+                    print("👋 Goodbye!")
+                    break
+                else:
+                    await mode[1](await shared_agent())
+                    
+            except KeyboardInterrupt:
+                print("\n👋 Goodbye!")
+                break
+            except Exception as e:
+                print(f"❌ An error occurred: {e}")
+                logger.error(f"Main loop error: {e}")
 
 if __name__ == "__main__":
     # Suppress playwright logs for cleaner output
@@ -6,6 +6,14 @@ from playwright.async_api import async_playwright
 
 load_dotenv()
 
+# Read once at import; use set_keep_open() to override instead of changing the environment
+KEEP_BROWSER_OPEN = os.getenv('KEEP_BROWSER_OPEN', 'false').lower() == 'true'
+
+def set_keep_open(keep_open: bool):
+    """Override the KEEP_BROWSER_OPEN setting read from the environment"""
+    global KEEP_BROWSER_OPEN
+    KEEP_BROWSER_OPEN = keep_open
+
 async def init_browser():
     """Initialize browser with Playwright and keep open if configured"""
     # Browser launch configuration
@@ -27,10 +35,8 @@ async def init_browser():
     await page.set_viewport_size({'width': 1280, 'height': 720})
 
     print("Browser successfully initialized")
-    keep_open = os.getenv('KEEP_BROWSER_OPEN', 'false').lower() == 'true'
-    
     try:
-        if keep_open:
+        if KEEP_BROWSER_OPEN:
             print("Keeping browser open (KEEP_BROWSER_OPEN=true)")
             print("Press Ctrl+C to exit...")
             try:
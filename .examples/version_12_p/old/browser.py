@@ -6,17 +6,48 @@ Handles browser lifecycle, navigation, and screenshot functionality
 import os
 import asyncio
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 from config import Config
 
+# Launched browsers shared by every BrowserManager in the process, keyed by type and launch options
+_shared_playwright = None
+_shared_browsers: Dict[Tuple[str, str], Browser] = {}
+
+async def _get_shared_browser(config: Config) -> Browser:
+    """Return a running browser for this config, launching it only the first time"""
+    global _shared_playwright
+    browser_name = config.get('browser_type')
+    options = config.get_browser_options()
+    key = (browser_name, repr(sorted(options.items())))
+    browser = _shared_browsers.get(key)
+    if browser is None or not browser.is_connected():
+        if _shared_playwright is None:
+            _shared_playwright = await async_playwright().start()
+        browser_type = getattr(_shared_playwright, browser_name)
+        browser = _shared_browsers[key] = await browser_type.launch(**options)
+    return browser
+
+async def close_shared_browsers() -> None:
+    """Close the shared browsers and Playwright; call once before the event loop ends"""
+    global _shared_playwright
+    for browser in _shared_browsers.values():
+        try:
+            await browser.close()
+        except Exception:
+            pass
+    _shared_browsers.clear()
+    
+    if _shared_playwright:
+        await _shared_playwright.stop()
+        _shared_playwright = None
+
 class BrowserManager:
     """Manages browser lifecycle and core operations"""
     
     def __init__(self, config: Config):
         """Initialize browser manager with configuration"""
         self.config = config
-        self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
@@ -34,14 +65,11 @@ class BrowserManager:
             os.makedirs(directory, exist_ok=True)
     
     async def start(self) -> None:
-        """Start browser and create context"""
-        if self.browser:
+        """Start a fresh context on the shared browser"""
+        if self.context:
             return
         
-        self.playwright = await async_playwright().start()
-        browser_type = getattr(self.playwright, self.config.get('browser_type'))
-        
-        self.browser = await browser_type.launch(**self.config.get_browser_options())
+        self.browser = await _get_shared_browser(self.config)
         self.context = await self.browser.new_context(**self.config.get_context_options())
         self.page = await self.context.new_page()
         
@@ -53,7 +81,7 @@ class BrowserManager:
             print(f"Browser started: {self.config.get('browser_type')}")
     
     async def stop(self) -> None:
-        """Stop browser and cleanup resources"""
+        """Close this manager's context; the browser stays up for reuse"""
         if self.page:
             await self.page.close()
             self.page = None
@@ -62,16 +90,10 @@ class BrowserManager:
             await self.context.close()
             self.context = None
         
-        if self.browser:
-            await self.browser.close()
-            self.browser = None
-        
-        if self.playwright:
-            await self.playwright.stop()
-            self.playwright = None
+        self.browser = None
         
         if self.config.get('verbose'):
-            print("Browser stopped")
+            print("Browser context closed")
     
     async def navigate(self, url: str) -> bool:
         """Navigate to URL with smart handling"""
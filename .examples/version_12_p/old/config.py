@@ -3,120 +3,379 @@ Configuration management for Browser Agent v12_p
 Handles environment variables, defaults, and browser settings
 """
 
+import functools
 import os
+import pickle
+import time
 from typing import Dict, Any, Optional
-from dotenv import load_dotenv
+
+_TRUTHY = frozenset(('true', '1', 'yes', 'on'))
+
+# Marks "not set" in lookups where None could be a real value
+_MISSING = object()
+
+# Chromium flags shared by every launch
+_BROWSER_ARGS = (
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+)
+
+def _to_bool(value: str, default: bool) -> bool:
+    """Coerce an environment string to bool"""
+    return value.lower() in _TRUTHY
+
+def _to_int(value: str, default: int) -> int:
+    """Coerce an environment string to int, keeping the default if it isn't a number"""
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+# type name in _SCHEMA -> coercion applied to values that are set in the environment
+_COERCE = {
+    'bool': _to_bool,
+    'int': _to_int,
+    'str': lambda value, default: value,
+}
+
+# (key, environment variable, type, default) for every setting
+_SCHEMA = (
+    # Browser settings
+    ('headless', 'HEADLESS', 'bool', True),
+    ('browser_type', 'BROWSER_TYPE', 'str', 'chromium'),
+    ('viewport_width', 'VIEWPORT_WIDTH', 'int', 1280),
+    ('viewport_height', 'VIEWPORT_HEIGHT', 'int', 720),
+    ('user_agent', 'USER_AGENT', 'str', None),
+
+    # Timeout settings
+    ('page_timeout', 'PAGE_TIMEOUT', 'int', 30000),
+    ('element_timeout', 'ELEMENT_TIMEOUT', 'int', 5000),
+    ('navigation_timeout', 'NAVIGATION_TIMEOUT', 'int', 30000),
+
+    # Screenshot settings
+    ('screenshot_dir', 'SCREENSHOT_DIR', 'str', 'screenshots'),
+    ('screenshot_quality', 'SCREENSHOT_QUALITY', 'int', 90),
+    ('auto_screenshot', 'AUTO_SCREENSHOT', 'bool', False),
+
+    # Element detection settings
+    ('element_selector_timeout', 'ELEMENT_SELECTOR_TIMEOUT', 'int', 2000),
+    ('click_timeout', 'CLICK_TIMEOUT', 'int', 3000),
+    ('max_elements', 'MAX_ELEMENTS', 'int', 50),
+
+    # Output settings
+    ('output_dir', 'OUTPUT_DIR', 'str', 'output'),
+    ('elements_file', 'ELEMENTS_FILE', 'str', 'elements.json'),
+    ('verbose', 'VERBOSE', 'bool', False),
+
+    # Default URL
+    ('default_url', 'DEFAULT_URL', 'str', 'https://www.google.com'),
+
+    # Login settings
+    ('demo_mode', 'DEMO_MODE', 'bool', False),
+    ('allow_real_login', 'ALLOW_REAL_LOGIN', 'bool', True),
+    ('max_login_attempts', 'MAX_LOGIN_ATTEMPTS', 'int', 3),
+
+    # Gmail credentials (for testing only)
+    ('gmail_email', 'GMAIL_EMAIL', 'str', ''),
+    ('gmail_password', 'GMAIL_PASSWORD', 'str', ''),
+    ('email_recipient', 'EMAIL_RECIPIENT', 'str', ''),
+    ('email_subject', 'EMAIL_SUBJECT', 'str', 'Test Email'),
+    ('email_body', 'EMAIL_BODY', 'str', 'Test message'),
+)
+
+# Parsed .env values written by Config.dump_cache(), kept next to this module; used instead of
+# re-parsing .env while newer than it. The process environment is still applied on top.
+CONFIG_CACHE_FILE = os.getenv(
+    'CONFIG_CACHE_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.config.cache.pkl'),
+)
+
+# How often Config.refresh_if_changed() may stat the env file, in seconds
+ENV_REFRESH_INTERVAL = 5.0
+
+# env file path -> [mtime when loaded, monotonic time of last check]
+_env_checks: Dict[str, list] = {}
+# Bumped on every reload so Config instances know to drop their tables
+_env_generation = 0
+
+@functools.lru_cache(maxsize=1)
+def _find_env_file() -> Optional[str]:
+    """Nearest .env walking up from this module's directory, like python-dotenv's find_dotenv()"""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(directory, '.env')
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+def _env_path(env_file: Optional[str]) -> Optional[str]:
+    """The env file a Config reads: env_file when it exists, otherwise the nearest .env"""
+    if env_file and os.path.exists(env_file):
+        return env_file
+    return _find_env_file()
+
+def _env_mtime(path: str) -> Optional[float]:
+    """Modification time of an env file, or None if it doesn't exist"""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+def _fast_parse_env(data: str) -> Optional[Dict[str, str]]:
+    """
+    Parse simple KEY=value lines without python-dotenv.
+    Returns None if the text uses syntax this parser doesn't handle, such as ${VAR}
+    expansion, escapes inside quotes or multi-line values.
+    """
+    if '${' in data:
+        return None
+    
+    parsed = {}
+    for line in data.splitlines():
+        line = line.strip()
+        if not line or line[0] == '#' or '=' not in line:
+            continue
+        key, _, value = line.partition('=')
+        key = key.strip()
+        if key.startswith('export '):
+            key = key[7:].strip()
+        value = value.strip()
+        if value[:1] in ('"', "'"):
+            if len(value) < 2 or value[-1] != value[0]:
+                return None  # Quoted value continues on the next line
+            value = value[1:-1]
+            if '\\' in value:
+                return None  # python-dotenv decodes escapes like \n and \" in quotes
+        else:
+            # A '#' after a space or tab starts an inline comment
+            value = value.replace('\t#', ' #').split(' #', 1)[0].rstrip()
+        parsed[key] = value
+    return parsed
+
+# python-dotenv's dotenv_values, imported only when a .env needs it
+_dotenv_values = None
+
+def _get_dotenv_values():
+    """Import python-dotenv on first use; None if it isn't installed"""
+    global _dotenv_values
+    if _dotenv_values is None:
+        try:
+            from dotenv import dotenv_values as _dotenv_values
+        except ImportError:
+            return None
+    return _dotenv_values
+
+def _read_env_file(path: str) -> Dict[str, str]:
+    """Values an env file defines, using python-dotenv only for syntax the fast parser skips"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read().decode('utf-8', 'replace')
+    except OSError:
+        return {}
+    parsed = _fast_parse_env(data)
+    if parsed is None:
+        dotenv_values = _get_dotenv_values()
+        parsed = {} if dotenv_values is None else {
+            key: value for key, value in dotenv_values(path).items() if value is not None
+        }
+    return parsed
+
+# Env files already exported to os.environ, and the variables that export added
+_exported_paths = set()
+_exported_keys = set()
+
+def _export_env_values(path: str, values: Dict[str, str]) -> None:
+    """Add an env file's values to os.environ once, never replacing variables that are already set"""
+    if path in _exported_paths:
+        return
+    _exported_paths.add(path)
+    for key, value in values.items():
+        if key not in os.environ:
+            os.environ[key] = value
+            _exported_keys.add(key)
+
+@functools.lru_cache(maxsize=None)
+def _environment(env_file: Optional[str]) -> Dict[str, str]:
+    """
+    Read the env file the first time a setting needs it and return it layered under the
+    process environment as a plain dict. Variables set outside the env file always win.
+    """
+    path = _env_path(env_file)
+    values = {}
+    if path is not None:
+        _env_checks.setdefault(path, [_env_mtime(path), time.monotonic()])
+        cached = _load_config_cache(path) if env_file is None else None
+        values = _read_env_file(path) if cached is None else cached
+        # Scripts that read os.getenv() directly still see the env file, as with load_dotenv()
+        _export_env_values(path, values)
+    process = {key: value for key, value in os.environ.items() if key not in _exported_keys}
+    return {**values, **process}
+
+def _reload_if_env_changed(path: str) -> None:
+    """Re-read an env file if its mtime moved, checking at most once per ENV_REFRESH_INTERVAL"""
+    global _env_generation
+    now = time.monotonic()
+    state = _env_checks.get(path)
+    if state is None:
+        _env_checks[path] = [_env_mtime(path), now]
+        return
+    if now - state[1] < ENV_REFRESH_INTERVAL:
+        return
+    state[1] = now
+    mtime = _env_mtime(path)
+    if mtime == state[0]:
+        return
+    state[0] = mtime
+    # The next lookup re-reads the file under the process environment; os.environ is left alone
+    _environment.cache_clear()
+    _resolved_values.cache_clear()
+    _env_generation += 1
+
+def _load_config_cache(path: str) -> Optional[Dict[str, str]]:
+    """Return the compiled values for env file `path` if the cache was built from it and is not older"""
+    try:
+        cache_mtime = os.stat(CONFIG_CACHE_FILE).st_mtime
+    except OSError:
+        return None
+    env_mtime = _env_mtime(path)
+    if env_mtime is not None and env_mtime > cache_mtime:
+        return None
+    try:
+        with open(CONFIG_CACHE_FILE, 'rb') as f:
+            cached_path, values = pickle.load(f)
+    except Exception:
+        return None  # Unreadable, truncated or written by an incompatible version
+    return values if cached_path == path else None
+
+@functools.lru_cache(maxsize=None)
+def _resolved_values(env_file: Optional[str]) -> Dict[str, Any]:
+    """Settings read so far for an env file, shared by every Config using it and filled on demand"""
+    return {}
 
 class Config:
     """Configuration manager for browser agent settings"""
     
+    __slots__ = ('_env_file', '_resolved', '_config', '_overrides', '_options', '_generation')
+    
+    # Process-wide instance handed out by Config.default()
+    _default: Optional['Config'] = None
+    
+    # key -> (environment variable, type, default); each is read on first get()
+    _SPEC = {key: spec for key, *spec in _SCHEMA}
+    
     def __init__(self, env_file: Optional[str] = None):
         """Initialize configuration with optional custom env file"""
-        if env_file and os.path.exists(env_file):
-            load_dotenv(env_file)
-        else:
-            load_dotenv()
-        
-        self._config = self._load_config()
+        self._env_file = env_file
+        self._resolved = _resolved_values(env_file)
+        # Starts out as the shared table itself; set() swaps in a private copy
+        self._config: Dict[str, Any] = self._resolved
+        # Values set() on this instance, re-applied after a reload
+        self._overrides: Dict[str, Any] = {}
+        self._generation = _env_generation
+        # Built option dicts by kind, dropped whenever set() changes a value
+        self._options: Dict[str, Dict[str, Any]] = {}
     
-    def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from environment variables with defaults"""
-        return {
-            # Browser settings
-            'headless': self._get_bool('HEADLESS', True),
-            'browser_type': os.getenv('BROWSER_TYPE', 'chromium'),
-            'viewport_width': self._get_int('VIEWPORT_WIDTH', 1280),
-            'viewport_height': self._get_int('VIEWPORT_HEIGHT', 720),
-            'user_agent': os.getenv('USER_AGENT', None),
-            
-            # Timeout settings
-            'page_timeout': self._get_int('PAGE_TIMEOUT', 30000),
-            'element_timeout': self._get_int('ELEMENT_TIMEOUT', 5000),
-            'navigation_timeout': self._get_int('NAVIGATION_TIMEOUT', 30000),
-            
-            # Screenshot settings
-            'screenshot_dir': os.getenv('SCREENSHOT_DIR', 'screenshots'),
-            'screenshot_quality': self._get_int('SCREENSHOT_QUALITY', 90),
-            'auto_screenshot': self._get_bool('AUTO_SCREENSHOT', False),
-            
-            # Element detection settings
-            'element_selector_timeout': self._get_int('ELEMENT_SELECTOR_TIMEOUT', 2000),
-            'click_timeout': self._get_int('CLICK_TIMEOUT', 3000),
-            'max_elements': self._get_int('MAX_ELEMENTS', 50),
-            
-            # Output settings
-            'output_dir': os.getenv('OUTPUT_DIR', 'output'),
-            'elements_file': os.getenv('ELEMENTS_FILE', 'elements.json'),
-            'verbose': self._get_bool('VERBOSE', False),
-            
-            # Default URL
-            'default_url': os.getenv('DEFAULT_URL', 'https://www.google.com'),
-            
-            # Login settings
-            'demo_mode': self._get_bool('DEMO_MODE', False),
-            'allow_real_login': self._get_bool('ALLOW_REAL_LOGIN', True),
-            'max_login_attempts': self._get_int('MAX_LOGIN_ATTEMPTS', 3),
-            
-            # Gmail credentials (for testing only)
-            'gmail_email': os.getenv('GMAIL_EMAIL', ''),
-            'gmail_password': os.getenv('GMAIL_PASSWORD', ''),
-            'email_recipient': os.getenv('EMAIL_RECIPIENT', ''),
-            'email_subject': os.getenv('EMAIL_SUBJECT', 'Test Email'),
-            'email_body': os.getenv('EMAIL_BODY', 'Test message'),
-        }
+    def refresh_if_changed(self) -> bool:
+        """Pick up .env edits in long-running processes; True if settings were reloaded"""
+        path = _env_path(self._env_file)
+        if path is not None:
+            _reload_if_env_changed(path)
+        if self._generation == _env_generation:
+            return False
+        self._generation = _env_generation
+        self._resolved = _resolved_values(self._env_file)
+        self._config = {**self._resolved, **self._overrides} if self._overrides else self._resolved
+        self._options.clear()
+        return True
     
-    def _get_bool(self, key: str, default: bool) -> bool:
-        """Get boolean value from environment with default"""
-        value = os.getenv(key, str(default)).lower()
-        return value in ('true', '1', 'yes', 'on')
+    @classmethod
+    def default(cls) -> 'Config':
+        """Shared configuration for callers that only read settings; use Config() to customize with set()"""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
     
-    def _get_int(self, key: str, default: int) -> int:
-        """Get integer value from environment with default"""
-        try:
-            return int(os.getenv(key, str(default)))
-        except ValueError:
-            return default
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Forget resolved settings so the next lookup re-reads the env file and environment"""
+        _resolved_values.cache_clear()
+        _environment.cache_clear()
+        cls._default = None
+    
+    @classmethod
+    def dump_cache(cls, path: Optional[str] = None) -> str:
+        """Parse the default .env and write its values to the compiled cache file"""
+        path = path or CONFIG_CACHE_FILE
+        env_path = _env_path(None)
+        # Read straight from .env, never from an existing cache; the environment is not baked in
+        values = _read_env_file(env_path) if env_path else {}
+        with open(path, 'wb') as f:
+            pickle.dump((env_path, values), f, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value by key"""
-        return self._config.get(key, default)
+        value = self._config.get(key, _MISSING)
+        if value is _MISSING:
+            spec = self._SPEC.get(key)
+            if spec is None:
+                return default
+            env_key, kind, fallback = spec
+            raw = _environment(self._env_file).get(env_key, _MISSING)
+            value = self._resolved[key] = fallback if raw is _MISSING else _COERCE[kind](raw, fallback)
+            if self._config is not self._resolved:
+                self._config[key] = value
+        return value
     
     def set(self, key: str, value: Any) -> None:
         """Set configuration value"""
+        if self._config is self._resolved:
+            # Copy on first write so other instances keep the shared values
+            self._config = dict(self._resolved)
         self._config[key] = value
+        self._overrides[key] = value
+        self._options.clear()
     
     def get_browser_options(self) -> Dict[str, Any]:
-        """Get browser launch options"""
-        options = {
-            'headless': self.get('headless'),
-            'args': [
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-blink-features=AutomationControlled',
-            ]
-        }
-        
-        if self.get('user_agent'):
-            options['args'].append(f'--user-agent={self.get("user_agent")}')
-        
+        """Get browser launch options (built once, treat as read-only)"""
+        self.refresh_if_changed()
+        options = self._options.get('browser')
+        if options is None:
+            user_agent = self.get('user_agent')
+            args = (*_BROWSER_ARGS, f'--user-agent={user_agent}') if user_agent else _BROWSER_ARGS
+            options = self._options['browser'] = {
+                'headless': self.get('headless'),
+                'args': list(args)
+            }
         return options
     
     def get_context_options(self) -> Dict[str, Any]:
-        """Get browser context options"""
-        return {
-            'viewport': {
-                'width': self.get('viewport_width'),
-                'height': self.get('viewport_height')
-            },
-            'user_agent': self.get('user_agent'),
-        }
+        """Get browser context options (built once, treat as read-only)"""
+        self.refresh_if_changed()
+        options = self._options.get('context')
+        if options is None:
+            options = self._options['context'] = {
+                'viewport': {
+                    'width': self.get('viewport_width'),
+                    'height': self.get('viewport_height')
+                },
+                'user_agent': self.get('user_agent'),
+            }
+        return options
     
     def get_page_options(self) -> Dict[str, Any]:
-        """Get page-specific options"""
-        return {
-            'timeout': self.get('page_timeout'),
-            'wait_until': 'domcontentloaded'
-        }
+        """Get page-specific options (built once, treat as read-only)"""
+        options = self._options.get('page')
+        if options is None:
+            options = self._options['page'] = {
+                'timeout': self.get('page_timeout'),
+                'wait_until': 'domcontentloaded'
+            }
+        return options
     
     def __str__(self) -> str:
         """String representation of config"""
@@ -9,6 +9,20 @@ from typing import List, Dict, Any, Optional, Tuple
 from playwright.async_api import Page, Locator
 from config import Config
 
+# Cheap page-state token: scroll offset, viewport size and a mutation counter kept by a
+# MutationObserver (installed on first use), so moved, restyled or edited nodes invalidate the scan
+_DOM_TOKEN_SCRIPT = """
+() => {
+    if (window.__elementMutations === undefined) {
+        window.__elementMutations = 0;
+        new MutationObserver(() => { window.__elementMutations++; }).observe(document, {
+            subtree: true, childList: true, attributes: true, characterData: true
+        });
+    }
+    return [window.scrollX, window.scrollY, window.innerWidth, window.innerHeight, window.__elementMutations];
+}
+"""
+
 class ElementManager:
     """Manages element detection, analysis, and interaction"""
     
@@ -17,13 +31,27 @@ class ElementManager:
         self.config = config
         self.page = page
         self.last_elements: List[Dict[str, Any]] = []
+        # Scan results keyed by (url, page-state token), dropped on main-frame navigation
+        self._elements_cache: Dict[Tuple[str, Tuple[int, ...]], List[Dict[str, Any]]] = {}
+        if page:
+            page.on("framenavigated", self._on_frame_navigated)
     
-    async def find_clickable_elements(self) -> List[Dict[str, Any]]:
-        """Find all clickable elements on the current page"""
+    def _on_frame_navigated(self, frame) -> None:
+        """Forget cached scans once the main frame loads a new document"""
+        if frame is self.page.main_frame:
+            self._elements_cache.clear()
+    
+    async def find_clickable_elements(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """Find all clickable elements on the current page, reusing the scan while the DOM is unchanged"""
         if not self.page:
             return []
         
         try:
+            key = (self.page.url, tuple(await self.page.evaluate(_DOM_TOKEN_SCRIPT)))
+            if not refresh and key in self._elements_cache:
+                self.last_elements = self._elements_cache[key]
+                return self.last_elements
+            
             # JavaScript to find clickable elements
             script = """
             () => {
@@ -88,7 +116,7 @@ class ElementManager:
                 element['clickable'] = True
                 element['description'] = self._generate_description(element)
             
-            self.last_elements = elements
+            self.last_elements = self._elements_cache[key] = elements
             
             if self.config.get('verbose'):
                 print(f"Found {len(elements)} clickable elements")
@@ -16,10 +16,44 @@ import os
 import sys
 from datetime import datetime
 from config import Config
-from old.browser import BrowserManager
+from old.browser import BrowserManager, close_shared_browsers
 from elements import ElementManager
 from login_manager import LoginManager
 
+# Candidate selectors per Gmail control, most specific first
+COMPOSE_SELECTORS = (
+    'div[data-tooltip="Compose"]',
+    '.T-I.T-I-KE.L3',
+    'div[role="button"][aria-label*="Compose"]',
+    '.z0 > .aic',
+    'div[role="button"]:has-text("Compose")',
+)
+TO_SELECTORS = (
+    'input[name="to"]',
+    'textarea[name="to"]',
+    'input[aria-label*="To"]',
+    'textarea[aria-label*="To"]',
+)
+SUBJECT_SELECTORS = (
+    'input[name="subjectbox"]',
+    'input[aria-label*="Subject"]',
+    'input[placeholder*="Subject"]',
+)
+BODY_SELECTORS = (
+    'div[role="textbox"]',
+    'div[aria-label*="Message"]',
+    'div[contenteditable="true"]',
+)
+SEND_SELECTORS = (
+    'div[data-tooltip="Send"]',
+    '.T-I.J-J5-Ji.aoO.v7.T-I-atl.L3',
+    'div[role="button"][aria-label*="Send"]',
+    'div[role="button"]:has-text("Send")',
+)
+
+# Appended to a selector so only visible matches count
+_VISIBLE = " >> visible=true"
+
 class GmailAutomationTest:
     """Gmail automation test with real credentials"""
 
@@ -196,7 +230,10 @@ class GmailAutomationTest:
         print("-" * 30)
 
         # Wait for inbox to load
-        await asyncio.sleep(3)
+        try:
+            await self.browser.page.wait_for_selector('div[role="main"]', timeout=10000)
+        except Exception as e:
+            print(f"⚠️ Inbox did not finish loading: {e}")
 
         current_url = self.browser.get_current_url()
         print(f"Current URL: {current_url}")
@@ -215,25 +252,14 @@ class GmailAutomationTest:
         print("-" * 30)
 
         # Look for compose button
-        compose_selectors = [
-            'div[data-tooltip="Compose"]',
-            '.T-I.T-I-KE.L3',
-            'div[role="button"][aria-label*="Compose"]',
-            '.z0 > .aic',
-            'div:has-text("Compose")'
-        ]
-
         compose_clicked = False
-        for selector in compose_selectors:
-            try:
-                print(f"Trying compose selector: {selector}")
-                await self.browser.page.wait_for_selector(selector, timeout=2000)
-                await self.browser.page.click(selector)
-                print(f"✅ Clicked compose button with selector: {selector}")
-                compose_clicked = True
-            except Exception as e:
-                print(f"❌ Selector {selector} failed: {e}")
-                continue
+        try:
+            compose = await self._first_visible(COMPOSE_SELECTORS, timeout=4000)
+            await compose.click()
+            print("✅ Clicked compose button")
+            compose_clicked = True
+        except Exception as e:
+            print(f"❌ Compose selectors failed: {e}")
 
         if not compose_clicked:
             print("❌ Could not find compose button")
@@ -258,7 +284,10 @@ class GmailAutomationTest:
                 raise Exception("Could not click compose button")
 
         # Wait for compose window
-        await asyncio.sleep(2)
+        try:
+            await self._first_visible(TO_SELECTORS, timeout=5000)
+        except Exception as e:
+            print(f"⚠️ Compose window did not open: {e}")
         # await self.browser.screenshot('step4_compose_opened.png')
         print("📸 Compose window screenshot saved")
 
@@ -269,54 +298,18 @@ class GmailAutomationTest:
         """Fill email composition fields"""
         print("📝 Filling email fields...")
 
-        # Fill recipient (To field)
-        to_selectors = [
-            'input[name="to"]',
-            'textarea[name="to"]',
-            'input[aria-label*="To"]',
-            'textarea[aria-label*="To"]'
-        ]
-
-        for selector in to_selectors:
-            try:
-                await self.browser.page.wait_for_selector(selector, timeout=2000)
-                await self.browser.page.fill(selector, self.credentials['recipient'], timeout=2000)
-                print(f"✅ Filled 'To' field: {self.credentials['recipient']}")
-                break
-            except:
-                continue
-
-        # Fill subject
-        subject_selectors = [
-            'input[name="subjectbox"]',
-            'input[aria-label*="Subject"]',
-            'input[placeholder*="Subject"]'
-        ]
-
-        for selector in subject_selectors:
-            try:
-                await self.browser.page.wait_for_selector(selector, timeout=2000)
-                await self.browser.page.fill(selector, self.credentials['subject'])
-                print(f"✅ Filled subject: {self.subject}")
-                break
-            except:
-                continue
-
-        # Fill body
-        body_selectors = [
-            'div[role="textbox"]',
-            'div[aria-label*="Message"]',
-            'div[contenteditable="true"]'
-        ]
-
-        for selector in body_selectors:
+        fields = (
+            ("'To' field", TO_SELECTORS, self.credentials['recipient']),
+            ("subject", SUBJECT_SELECTORS, self.credentials['subject']),
+            ("body", BODY_SELECTORS, self.credentials['body']),
+        )
+        for label, selectors, value in fields:
             try:
-                await self.browser.page.wait_for_selector(selector, timeout=2000)
-                await self.browser.page.fill(selector, self.body)
-                print(f"✅ Filled body: {self.body}")
-                break
-            except:
-                continue
+                field = await self._first_visible(selectors, timeout=4000)
+                await field.fill(value)
+                print(f"✅ Filled {label}: {value}")
+            except Exception as e:
+                print(f"❌ Could not fill {label}: {e}")
 
         # await self.browser.screenshot('step4_email_filled.png')
         print("📸 Email form filled screenshot saved")
@@ -335,35 +328,43 @@ class GmailAutomationTest:
         # We can't get input in async context easily, so we'll proceed
         # In a real implementation, you'd want better confirmation
 
-        send_selectors = [
-            'div[data-tooltip="Send"]',
-            '.T-I.J-J5-Ji.aoO.v7.T-I-atl.L3',
-            'div[role="button"][aria-label*="Send"]',
-            'div:has-text("Send")'
-        ]
-
         email_sent = False
-        for selector in send_selectors:
-            try:
-                await self.browser.page.wait_for_selector(selector, timeout=2000)
-                await self.browser.page.click(selector)
-                print(f"✅ Clicked send button with selector: {selector}")
-                email_sent = True
-                break
-            except Exception as e:
-                print(f"❌ Send selector {selector} failed: {e}")
-                continue
+        try:
+            send = await self._first_visible(SEND_SELECTORS, timeout=4000)
+            await send.click()
+            print("✅ Clicked send button")
+            email_sent = True
+        except Exception as e:
+            print(f"❌ Send selectors failed: {e}")
 
         if not email_sent:
             print("❌ Could not find send button")
             raise Exception("Could not send email")
 
-        # Wait for send confirmation
-        await asyncio.sleep(3)
+        # Wait for the "Message sent" toast
+        try:
+            await self.browser.page.wait_for_selector('.bAq', timeout=5000)
+        except Exception:
+            print("❌ No send confirmation seen")
+            raise Exception("Email send was not confirmed")
         # await self.browser.screenshot('step5_email_sent.png')
         print("📸 Email sent screenshot saved")
         print("✅ EMAIL SENT SUCCESSFULLY!")
 
+    async def _first_visible(self, selectors, timeout: int):
+        """
+        Wait once until any candidate is visible, then return the first candidate in priority
+        order that has a visible match; a joined selector alone would pick by document order.
+        """
+        page = self.browser.page
+        any_match = page.locator(", ".join(selectors) + _VISIBLE).first
+        await any_match.wait_for(state="visible", timeout=timeout)
+        for selector in selectors:
+            locator = page.locator(selector + _VISIBLE)
+            if await locator.count():
+                return locator.first
+        return any_match
+
     async def _analyze_elements(self, step: str):
         """Analyze elements using Gemini API"""
         print(f"\n🤖 Analyzing elements for {step} using Gemini API...")
@@ -386,7 +387,10 @@ async def main():
         sys.exit(1)
 
     # Run the test
-    success = await test.run_complete_test()
+    try:
+        success = await test.run_complete_test()
+    finally:
+        await close_shared_browsers()
 
     if success:
         print("\n🎉 ALL TESTS COMPLETED SUCCESSFULLY!")
@@ -12,6 +12,38 @@ from dataclasses import dataclass, field
 from config import Config
 from old.browser import BrowserManager
 
+# For each {role: [selectors]} group, the first selector (in priority order) with a visible match.
+# Runs in the page, so every login control is located in one round trip.
+LOGIN_PROBE_SCRIPT = """
+(groups) => {
+    const visible = el => {
+        const rect = el.getBoundingClientRect();
+        if (rect.width === 0 || rect.height === 0) return false;
+        const style = window.getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none';
+    };
+    // Playwright's :has-text() is not CSS, so match it on text content here
+    const matches = selector => {
+        const hasText = selector.match(/^(.*):has-text\\("(.*)"\\)$/);
+        if (hasText) {
+            const needle = hasText[2].toLowerCase();
+            return Array.from(document.querySelectorAll(hasText[1])).filter(el =>
+                (el.textContent || '').replace(/\\s+/g, ' ').toLowerCase().includes(needle));
+        }
+        try {
+            return Array.from(document.querySelectorAll(selector));
+        } catch (e) {
+            return [];
+        }
+    };
+    const found = {};
+    for (const [role, selectors] of Object.entries(groups)) {
+        found[role] = selectors.find(selector => matches(selector).some(visible)) || null;
+    }
+    return found;
+}
+"""
+
 @dataclass
 class LoginSession:
     """Maintains login session state"""
@@ -227,22 +259,23 @@ class LoginManager:
             return False
     
     async def _find_field(self, field_type: str) -> Optional[Any]:
-        """Find form field by type using multiple selectors"""
-        if field_type not in self.login_selectors:
+        """Find form field by type: one wait for any candidate, then the highest-priority visible one"""
+        selectors = self.login_selectors.get(field_type)
+        if not selectors:
             return None
         
-        for selector in self.login_selectors[field_type]:
-            try:
-                field = await self.browser.page.wait_for_selector(
-                    selector, 
-                    timeout=self.config.get('element_timeout', 2000)
-                )
-                if field:
-                    return field
-            except:
-                continue
+        page = self.browser.page
+        try:
+            await page.wait_for_selector(
+                ", ".join(selectors),
+                timeout=self.config.get('element_timeout', 2000)
+            )
+            found = await page.evaluate(LOGIN_PROBE_SCRIPT, {field_type: selectors})
+        except Exception:
+            return None
         
-        return None
+        selector = found.get(field_type)
+        return page.locator(f"{selector} >> visible=true").first if selector else None
     
     async def _submit_login_form(self, password_field) -> bool:
         """Submit login form using button or Enter key"""
@@ -295,38 +328,22 @@ class LoginManager:
         }
         
         try:
-            # Check for username field
-            for selector in self.login_selectors['username']:
-                try:
-                    field = await self.browser.page.wait_for_selector(selector, timeout=500)
-                    if field:
-                        analysis['username_field'] = True
-                        analysis['selectors_found'].append(f'username: {selector}')
-                        break
-                except:
-                    continue
-            
-            # Check for password field
-            for selector in self.login_selectors['password']:
-                try:
-                    field = await self.browser.page.wait_for_selector(selector, timeout=500)
-                    if field:
-                        analysis['password_field'] = True
-                        analysis['selectors_found'].append(f'password: {selector}')
-                        break
-                except:
-                    continue
+            # One wait for any login control, then a single probe for all three groups
+            page = self.browser.page
+            all_selectors = [selector for group in self.login_selectors.values() for selector in group]
+            try:
+                await page.wait_for_selector(
+                    ", ".join(all_selectors),
+                    timeout=self.config.get('element_selector_timeout', 2000)
+                )
+            except Exception:
+                pass  # Nothing showed up; the probe reports every control as missing
+            found = await page.evaluate(LOGIN_PROBE_SCRIPT, self.login_selectors)
             
-            # Check for submit button
-            for selector in self.login_selectors['submit']:
-                try:
-                    button = await self.browser.page.wait_for_selector(selector, timeout=500)
-                    if button:
-                        analysis['submit_button'] = True
-                        analysis['selectors_found'].append(f'submit: {selector}')
-                        break
-                except:
-                    continue
+            for role, key in (('username', 'username_field'), ('password', 'password_field'), ('submit', 'submit_button')):
+                if found.get(role):
+                    analysis[key] = True
+                    analysis['selectors_found'].append(f'{role}: {found[role]}')
             
             # Overall form detection
             analysis['form_detected'] = (analysis['username_field'] and 